@@ -4,9 +4,94 @@ Brightness analyzer for detecting the brightest points in images and videos
 
 import os
 import time
+import queue
+import threading
+import heapq
+import logging
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 
+logger = logging.getLogger(__name__)
+
+try:
+    # Optional JIT compiler for the brightness sum kernel
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    # Optional FFmpeg subprocess reader for video analysis
+    import imageio_ffmpeg
+    IMAGEIO_FFMPEG_AVAILABLE = True
+except ImportError:
+    IMAGEIO_FFMPEG_AVAILABLE = False
+
+# Let OpenCV use every core for the per-frame work (decoding, color
+# conversion, reductions). Note that this configures OpenCV's thread pool
+# globally, for every module in the process, not only for this analyzer.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(max(1, os.cpu_count() or 4))
+
+# OpenCL device for the optional "use_opencl" reductions (desktops with a
+# GPU; the Raspberry Pi has none)
+OPENCL_AVAILABLE = cv2.ocl.haveOpenCL()
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _sum_channels(image, out):
+        """Write R + G + B of a uint8 color image into a uint16 buffer"""
+        height, width = out.shape
+        for y in prange(height):
+            for x in range(width):
+                out[y, x] = (np.uint16(image[y, x, 0]) +
+                             np.uint16(image[y, x, 1]) +
+                             np.uint16(image[y, x, 2]))
+    
+    @njit(parallel=True, cache=True)
+    def _max_sum_location(image):
+        """Return (max R + G + B, x, y) of a uint8 color image, first in raster order"""
+        height, width = image.shape[0], image.shape[1]
+        row_max = np.empty(height, dtype=np.int32)
+        row_arg = np.empty(height, dtype=np.int64)
+        for y in prange(height):
+            best = -1
+            best_x = 0
+            for x in range(width):
+                total = (np.int32(image[y, x, 0]) +
+                         np.int32(image[y, x, 1]) +
+                         np.int32(image[y, x, 2]))
+                if total > best:
+                    best = total
+                    best_x = x
+            row_max[y] = best
+            row_arg[y] = best_x
+        y = np.argmax(row_max)
+        return row_max[y], row_arg[y], y
+
+# Numba's default threading layer must not launch parallel kernels from
+# two threads at once; warm_up_kernels runs on a background thread
+_kernel_lock = threading.Lock()
+
+
+def warm_up_kernels():
+    """
+    Compile the Numba kernels, or load them from Numba's cache
+    
+    Called on a background thread at startup, so the first analysis does
+    not wait for the JIT. Does nothing without Numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    # Same argument types as real frames: C-contiguous uint8 color images
+    image = np.zeros((2, 2, 3), dtype=np.uint8)
+    with _kernel_lock:
+        _sum_channels(image, np.empty((2, 2), dtype=np.uint16))
+        _max_sum_location(image)
+
 
 class BrightnessAnalyzer:
     """
@@ -17,7 +102,27 @@ class BrightnessAnalyzer:
     def __init__(self, config):
         """Initialize the analyzer with configuration"""
         self.config = config
-        self.progress = 0
+        self.progress_callback = None  # Called with each new progress value
+        self._progress = 0
+        self._video_scan_cache = None  # (key, scan result) of the last video
+        
+        # Enable OpenCV's OpenCL path once, and only when it was asked for;
+        # _opencl_enabled then only reads the process-wide state
+        if OPENCL_AVAILABLE and self.config.get("use_opencl", False):
+            cv2.ocl.setUseOpenCL(True)
+    
+    @property
+    def progress(self):
+        """Progress of the running analysis in percent"""
+        return self._progress
+    
+    @progress.setter
+    def progress(self, value):
+        # Only report changes, so a long video reports at most 101 updates
+        if value != self._progress:
+            self._progress = value
+            if self.progress_callback is not None:
+                self.progress_callback(value)
     
     def calculate_brightness(self, image):
         """
@@ -31,39 +136,172 @@ class BrightnessAnalyzer:
             Brightness matrix with same dimensions as input
         """
         if len(image.shape) == 3:  # Color image
-            # Extract RGB channels
-            r, g, b = cv2.split(image)
-            
-            # Apply simple average formula
-            brightness = (r.astype(np.float32) + 
-                         g.astype(np.float32) + 
-                         b.astype(np.float32)) / 3.0
-            
+            # Sum the channels exactly in integers, then scale once, instead
+            # of widening all three channels to float32 first
+            brightness = self.calculate_brightness_sum(image).astype(np.float32)
+            brightness /= 3.0
             return brightness
         else:  # Grayscale image
             return image.astype(np.float32)
     
+    def _max_brightness_u8(self, image):
+        """
+        Cheap upper bound for the maximum brightness of an image
+        
+        The average of three channels never exceeds the largest channel,
+        so the maximum over all channels bounds the maximum brightness
+        without materializing a brightness matrix.
+        
+        Args:
+            image: Input image (RGB or grayscale)
+            
+        Returns:
+            Upper bound of the maximum brightness value
+        """
+        return int(image.max())
+    
+    def _max_channel_sum(self, image):
+        """
+        Exact maximum of R + G + B over an image without float conversion
+        
+        Args:
+            image: Input image (RGB or grayscale)
+            
+        Returns:
+            Maximum channel sum (maximum brightness times 3 for color images)
+        """
+        return self._locate_max_sum(image)[0]
+    
+    def _opencl_enabled(self):
+        """Whether color frames are reduced on the OpenCL device"""
+        # cv2.ocl.setUseOpenCL(False) elsewhere in the process still wins
+        return (OPENCL_AVAILABLE and self.config.get("use_opencl", False)
+                and cv2.ocl.useOpenCL())
+    
+    def _locate_max_sum_opencl(self, image):
+        """
+        Find the maximum R + G + B of a color image on the OpenCL device
+        
+        The frame is uploaded once as a UMat and only the maximum and its
+        location are read back; the sum map stays on the device.
+        
+        Args:
+            image: Input color image
+            
+        Returns:
+            (max_sum, (x, y), None), like _locate_max_sum
+        """
+        channels = cv2.split(cv2.UMat(image))
+        brightness_sum = cv2.add(channels[0], channels[1], dtype=cv2.CV_16U)
+        brightness_sum = cv2.add(brightness_sum, channels[2], dtype=cv2.CV_16U)
+        _, max_sum, _, max_loc = cv2.minMaxLoc(brightness_sum)
+        return int(max_sum), max_loc, None
+    
+    def _locate_max_sum(self, image, out=None):
+        """
+        Find the maximum R + G + B of an image and its location
+        
+        With Numba, uint8 color images are scanned by a fused kernel that
+        never writes a brightness sum map; otherwise the map is built in
+        out and scanned with cv2.minMaxLoc. Ties go to the first point in
+        raster-scan order either way. With the "use_opencl" setting and
+        an OpenCL device, color images are reduced on the device instead.
+        
+        Args:
+            image: Input image (RGB or grayscale)
+            out: Optional uint16 buffer for the brightness sum
+            
+        Returns:
+            (max_sum, (x, y), brightness_sum); brightness_sum is None when
+            no sum map was built
+        """
+        if len(image.shape) == 3 and self._opencl_enabled():
+            return self._locate_max_sum_opencl(image)
+        
+        if len(image.shape) == 3 and NUMBA_AVAILABLE and image.dtype == np.uint8:
+            with _kernel_lock:
+                max_sum, x, y = _max_sum_location(image)
+            return int(max_sum), (int(x), int(y)), None
+        
+        brightness_sum = self.calculate_brightness_sum(image, out=out)
+        _, max_sum, _, max_loc = cv2.minMaxLoc(brightness_sum)
+        return int(max_sum), max_loc, brightness_sum
+    
+    def calculate_brightness_sum(self, image, out=None):
+        """
+        Calculate brightness scaled by 3 as exact integers:
+        brightness_sum = R + G + B
+        
+        Stores 2 bytes per pixel instead of the 4 of a float32 brightness
+        matrix while keeping full precision (brightness = sum / 3).
+        
+        Args:
+            image: Input image (RGB or grayscale)
+            out: Optional uint16 buffer to write into; a new one is
+                allocated if it is None or does not match the image size
+            
+        Returns:
+            uint16 matrix with same dimensions as input
+        """
+        if out is None or out.shape != image.shape[:2]:
+            out = np.empty(image.shape[:2], dtype=np.uint16)
+        
+        if len(image.shape) == 3 and NUMBA_AVAILABLE and image.dtype == np.uint8:
+            # Read each pixel once and write its sum in a single fused loop
+            with _kernel_lock:
+                _sum_channels(image, out)
+        elif len(image.shape) == 3:  # Color image
+            # Accumulate into a single uint16 buffer (max 765 fits)
+            np.add(image[..., 0], image[..., 1], out=out, dtype=np.uint16)
+            np.add(out, image[..., 2], out=out)
+        else:  # Grayscale image
+            np.multiply(image, 3, out=out, dtype=np.uint16)
+        return out
+    
     def find_brightest_point(self, brightness):
         """
         Find coordinates of the brightest point in the brightness matrix
         
+        Ties are resolved in raster-scan order: if several points share the
+        maximum brightness, the first one row by row is returned. No index
+        arrays are built for the tied points, so flat or overexposed frames
+        cost no more than any other frame.
+        
         Args:
             brightness: Brightness matrix
             
         Returns:
             (x, y) coordinates of the brightest point
         """
-        # Find the maximum brightness value
-        max_val = np.max(brightness)
+        return self.locate_max_brightness(brightness)[1]
+    
+    def locate_max_brightness(self, brightness):
+        """
+        Find the maximum brightness value and its location in one pass
         
-        # Get coordinates of the brightest point (y, x)
-        y, x = np.where(brightness == max_val)
+        Args:
+            brightness: Brightness matrix
+            
+        Returns:
+            (max_brightness, (x, y)) for the brightest point
+        """
+        stride = self.config.get("search_stride", 1)
+        if stride > 1:
+            # Coarse search on a decimated view, then refine in the
+            # neighbourhood of the coarse maximum at full resolution
+            coarse = brightness[::stride, ::stride]
+            cy, cx = divmod(int(np.argmax(coarse)), coarse.shape[1])
+            y_min = max(0, (cy - 1) * stride)
+            x_min = max(0, (cx - 1) * stride)
+            region = brightness[y_min:(cy + 1) * stride + 1, x_min:(cx + 1) * stride + 1]
+            y, x = divmod(int(np.argmax(region)), region.shape[1])
+            return region[y, x], (x_min + x, y_min + y)
         
-        # If multiple points have the same brightness, take the first one
-        if len(x) > 0 and len(y) > 0:
-            return (int(x[0]), int(y[0]))
-        else:
-            return (0, 0)
+        # cv2.minMaxLoc returns the value and (x, y) location of the
+        # maximum together; if multiple points have the same brightness,
+        # the first one in raster-scan order is returned
+        _, max_val, _, max_loc = cv2.minMaxLoc(brightness)
+        return max_val, max_loc
     
     def calculate_average_brightness(self, brightness, point, radius=10):
         """
@@ -100,25 +338,57 @@ class BrightnessAnalyzer:
             brightness: Brightness matrix
             
         Returns:
-            Histogram of brightness values (256 bins)
-        """
-        # Normalize brightness to 0-255 range
-        brightness_norm = cv2.normalize(
-            brightness, 
-            None, 
-            alpha=0, 
-            beta=255, 
-            norm_type=cv2.NORM_MINMAX, 
-            dtype=cv2.CV_8U
-        )
+            Histogram of brightness values (256 bins, one per brightness level)
+        """
+        # Brightness is already in the 0-255 range, so bin the integer
+        # levels directly instead of normalizing first
+        levels = brightness.astype(np.uint8)
         
-        # Calculate histogram
-        hist = cv2.calcHist([brightness_norm], [0], None, [256], [0, 256])
+        # Calculate histogram in a single pass
+        hist = np.bincount(levels.ravel(), minlength=256)
         
         # Convert to list
-        hist_list = [h[0] for h in hist]
+        return hist.tolist()
+    
+    def _summarize_brightness(self, image, brightness_sum=None, brightest_point=None):
+        """
+        Compute the brightness statistics reported for an analyzed frame
         
-        return hist_list
+        Works on the uint16 brightness sum, so every reduction streams half
+        the bytes of a float32 brightness matrix without losing precision.
+        
+        Args:
+            image: Input image (RGB or grayscale)
+            brightness_sum: Brightness sum of the image, if already computed
+            brightest_point: (x, y) of its maximum, if already located
+            
+        Returns:
+            (max_brightness, (x, y), average_brightness, histogram)
+        """
+        if brightness_sum is None:
+            brightness_sum = self.calculate_brightness_sum(image)
+        
+        # Find the brightest point and maximum brightness value, unless the
+        # caller already located it while scanning frames
+        if brightest_point is None:
+            max_sum, brightest_point = self.locate_max_brightness(brightness_sum)
+        else:
+            x, y = brightest_point
+            max_sum = int(brightness_sum[y, x])
+        
+        # Calculate average brightness around the brightest point
+        average_sum = self.calculate_average_brightness(
+            brightness_sum,
+            brightest_point,
+            radius=self.config.get("average_area_size", 10)
+        )
+        
+        # Calculate brightness histogram; level k covers the sums 3k, 3k+1
+        # and 3k+2, so fold the 768 sum bins into 256 brightness bins
+        sum_hist = np.bincount(brightness_sum.ravel(), minlength=768)
+        histogram = sum_hist.reshape(256, 3).sum(axis=1).tolist()
+        
+        return max_sum / 3.0, brightest_point, average_sum / 3.0, histogram
     
     def enhance_contrast(self, image, contrast_factor=1.5):
         """
@@ -131,51 +401,37 @@ class BrightnessAnalyzer:
         Returns:
             Image with enhanced contrast
         """
-        # Convert to float32 for calculations
-        img_float = image.astype(np.float32)
-        
-        # Calculate mean brightness
-        mean_brightness = np.mean(img_float)
+        # Calculate mean brightness over all channels
+        channels = image.shape[2] if len(image.shape) == 3 else 1
+        mean_brightness = float(np.mean(cv2.mean(image)[:channels]))
         
-        # Apply contrast enhancement
-        enhanced = mean_brightness + contrast_factor * (img_float - mean_brightness)
-        
-        # Clip values to valid range
-        enhanced = np.clip(enhanced, 0, 255)
-        
-        return enhanced.astype(np.uint8)
+        # Apply contrast enhancement as a single saturating affine pass:
+        # mean + k * (img - mean) == k * img + mean * (1 - k)
+        return cv2.addWeighted(
+            image, contrast_factor,
+            image, 0,
+            mean_brightness * (1.0 - contrast_factor)
+        )
 
     def analyze_image(self, image):
         """
         Analyze a single image for brightness
         
+        The image is only read, never modified, so callers pass the frame
+        they display without copying it first.
+        
         Args:
             image: Input image (RGB or grayscale)
             
         Returns:
             Dictionary with analysis results
         """
-        # Calculate brightness matrix
-        brightness = self.calculate_brightness(image)
-        
-        # Find the brightest point
-        brightest_point = self.find_brightest_point(brightness)
-        
-        # Get maximum brightness value
-        max_brightness = np.max(brightness)
-        
-        # Calculate average brightness around the brightest point
-        average_brightness = self.calculate_average_brightness(
-            brightness, 
-            brightest_point, 
-            radius=self.config.get("average_area_size", 10)
-        )
-        
-        # Calculate brightness histogram
-        histogram = self.calculate_histogram(brightness)
+        # Calculate brightness, brightest point, average and histogram
+        (max_brightness, brightest_point,
+         average_brightness, histogram) = self._summarize_brightness(image)
         
         # Enhance contrast of the image
-        enhanced_image = self.enhance_contrast(image.copy())
+        enhanced_image = self.enhance_contrast(image)
         
         # Create marked image for visualization
         brightest_frame_marked = self.draw_markers(
@@ -201,13 +457,17 @@ class BrightnessAnalyzer:
             }
         }
     
-    def analyze_video(self, video_capture, sample_rate=5):
+    def analyze_video(self, video_capture, sample_rate=5, file_path=None):
         """
         Analyze a video to find the brightest point across all frames
         
         Args:
             video_capture: OpenCV VideoCapture object
             sample_rate: Sample every N frames for better performance
+            file_path: Path of the video. With the "use_ffmpeg_streaming"
+                setting and imageio-ffmpeg installed, frames are decoded by
+                an FFmpeg subprocess reading this file instead of by
+                video_capture
             
         Returns:
             Dictionary with analysis results
@@ -217,64 +477,37 @@ class BrightnessAnalyzer:
         fps = video_capture.get(cv2.CAP_PROP_FPS)
         
         # Initialize variables
-        global_max_brightness = 0
         global_brightest_point = (0, 0)
-        global_brightest_frame = None
-        global_frame_number = 0
-        frame_count = 0
-        
-        # Reset video to beginning
-        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        
-        # Process every Nth frame based on sample_rate
-        while True:
-            # Read the frame
-            ret, frame = video_capture.read()
-            
-            if not ret:  # End of video
-                break
-            
-            # Update progress
-            self.progress = int((frame_count / total_frames) * 100)
-            
-            # Process only every sample_rate frames
-            if frame_count % sample_rate == 0:
-                # Convert to RGB for consistent processing
-                if len(frame.shape) == 3:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                else:
-                    frame_rgb = frame
-                
-                # Calculate brightness
-                brightness = self.calculate_brightness(frame_rgb)
-                
-                # Find max brightness in this frame
-                max_brightness = np.max(brightness)
-                
-                # If brighter than previous max, update
-                if max_brightness > global_max_brightness:
-                    global_max_brightness = max_brightness
-                    global_brightest_point = self.find_brightest_point(brightness)
-                    global_brightest_frame = frame_rgb.copy()
-                    global_frame_number = frame_count
-            
-            frame_count += 1
+        stride = self.config.get("search_stride", 1)
         
-        # Reset video position
-        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        # Analyzing the same file again with the same scan settings (e.g.
+        # after changing the highlight radius) reuses the brightest frame
+        # instead of decoding the whole video again
+        cache_key = self._video_scan_key(file_path, sample_rate, stride)
+        if (cache_key is not None and self._video_scan_cache is not None and
+                self._video_scan_cache[0] == cache_key):
+            (global_max_brightness, cached_frame,
+             global_frame_number, winner_point) = self._video_scan_cache[1]
+            global_brightest_frame = cached_frame.copy() if cached_frame is not None else None
+            global_brightness_sum = None
+        else:
+            (global_max_brightness, global_brightest_frame, global_frame_number,
+             global_brightness_sum, winner_point) = self._find_brightest_video_frame(
+                video_capture, total_frames, sample_rate, stride, file_path)
+            if cache_key is not None:
+                cached_frame = global_brightest_frame.copy() if global_brightest_frame is not None else None
+                self._video_scan_cache = (cache_key, (
+                    global_max_brightness, cached_frame, global_frame_number, winner_point))
         
         # Calculate average brightness around brightest point
         if global_brightest_frame is not None:
-            brightness = self.calculate_brightness(global_brightest_frame)
-            average_brightness = self.calculate_average_brightness(
-                brightness, 
-                global_brightest_point,
-                radius=self.config.get("average_area_size", 10)
+            (global_max_brightness, global_brightest_point,
+             average_brightness, histogram) = self._summarize_brightness(
+                global_brightest_frame,
+                global_brightness_sum,
+                winner_point
             )
             
-            # Calculate histogram for the brightest frame
-            histogram = self.calculate_histogram(brightness)
-            
             # Create marked image for visualization
             brightest_frame_marked = self.draw_markers(
                 global_brightest_frame.copy(),
@@ -308,12 +541,410 @@ class BrightnessAnalyzer:
             }
         }
     
+    def _video_scan_key(self, file_path, sample_rate, stride):
+        """
+        Key identifying a video scan for the scan cache
+        
+        Args:
+            file_path: Path of the video, or None
+            sample_rate: Sample rate of the scan
+            stride: Search stride of the scan
+            
+        Returns:
+            Hashable key covering the file and every setting that affects
+            which frame and point are found, or None if the file is unknown
+        """
+        if file_path is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        two_pass = self.config.get("two_pass", False)
+        return (
+            os.path.abspath(file_path), stat.st_mtime, stat.st_size,
+            sample_rate, stride, two_pass,
+            self.config.get("two_pass_candidates", 16) if two_pass else None,
+            IMAGEIO_FFMPEG_AVAILABLE and self.config.get("use_ffmpeg_streaming", False)
+        )
+    
+    def _find_brightest_video_frame(self, video_capture, total_frames, sample_rate, stride, file_path):
+        """
+        Decode a video and find its brightest sampled frame
+        
+        Args:
+            video_capture: OpenCV VideoCapture object
+            total_frames: Number of frames, for progress reporting
+            sample_rate: Scan only every Nth frame
+            stride: Decimation for the brightest-point search (1 = exact)
+            file_path: Path of the video, for FFmpeg streaming
+            
+        Returns:
+            (max_brightness, frame, frame_number, brightness_sum, point) as
+            returned by _scan_frames, with the frame converted to RGB
+        """
+        # Reset video to beginning
+        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        
+        # Decode frames on a reader thread so decoding overlaps with the
+        # brightness computation; the bounded queue keeps memory in check
+        frame_queue = queue.Queue(maxsize=8)
+        stop_event = threading.Event()
+        if (file_path is not None and IMAGEIO_FFMPEG_AVAILABLE and
+                self.config.get("use_ffmpeg_streaming", False)):
+            reader = threading.Thread(
+                target=self._read_ffmpeg_frames,
+                args=(file_path, frame_queue, stop_event, sample_rate),
+                daemon=True
+            )
+        else:
+            reader = threading.Thread(
+                target=self._read_frames,
+                args=(video_capture, frame_queue, stop_event, sample_rate),
+                daemon=True
+            )
+        reader.start()
+        
+        two_pass = self.config.get("two_pass", False)
+        try:
+            # Scan the sampled frames until the reader signals the end; it
+            # only queues every Nth frame. Brightness is channel-order
+            # invariant, so frames stay in BGR and only the winner is
+            # converted afterwards
+            if two_pass:
+                candidates = self._rank_downscaled_frames(
+                    self._queued_frames(frame_queue), total_frames, sample_rate,
+                    sampled=True)
+            else:
+                (global_max_brightness, global_brightest_frame, global_frame_number,
+                 global_brightness_sum, winner_point) = self._scan_frames(
+                    self._queued_frames(frame_queue), total_frames, sample_rate, stride,
+                    sampled=True)
+        finally:
+            # Stop the reader and drain the queue so it cannot block on put
+            stop_event.set()
+            while reader.is_alive():
+                try:
+                    frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            reader.join()
+        
+        if two_pass:
+            # Rescan only the candidates, at full resolution
+            (global_max_brightness, global_brightest_frame, global_frame_number,
+             global_brightness_sum, winner_point) = self._scan_candidates(
+                video_capture, candidates)
+        
+        # Reset video position
+        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        
+        # Convert the winning frame to RGB for consistent processing
+        if global_brightest_frame is not None and len(global_brightest_frame.shape) == 3:
+            global_brightest_frame = cv2.cvtColor(global_brightest_frame, cv2.COLOR_BGR2RGB)
+        
+        return (global_max_brightness, global_brightest_frame, global_frame_number,
+                global_brightness_sum, winner_point)
+    
+    def _frame_workers(self):
+        """
+        Number of threads scanning frames in _scan_frames
+        
+        The Numba kernels already spread each scan over every core (and
+        must not be launched from several threads at once), so frames are
+        only scanned in parallel on the NumPy path.
+        
+        Returns:
+            Thread count, 1 for a serial scan
+        """
+        if NUMBA_AVAILABLE:
+            return 1
+        workers = self.config.get("frame_workers", 0)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return workers
+    
+    def _scan_sample(self, sample, threshold, out=None):
+        """
+        Locate the maximum brightness sum of a frame that may beat threshold
+        
+        Args:
+            sample: Frame (or decimated frame) to scan
+            threshold: Current maximum brightness
+            out: Optional uint16 buffer for the brightness sum
+            
+        Returns:
+            Result of _locate_max_sum, or None if the frame's upper bound
+            cannot beat threshold
+        """
+        if self._max_brightness_u8(sample) <= threshold:
+            return None
+        return self._locate_max_sum(sample, out=out)
+    
+    def _scan_frames(self, frames, total_frames, sample_rate, stride, sampled=False):
+        """
+        Find the brightest of every sample_rate-th frame
+        
+        Frames whose upper bound cannot beat the current maximum are
+        skipped. With several frame workers the scans run on a thread
+        pool (NumPy and OpenCV release the GIL), a bounded number of
+        frames ahead, while results are still reduced in frame order: a
+        frame only replaces the maximum if it is strictly brighter, so
+        ties go to the earliest frame just as in a serial scan.
+        
+        Args:
+            frames: Iterable of frames
+            total_frames: Number of frames, for progress reporting
+            sample_rate: Scan only every Nth frame
+            stride: Decimation for the brightest-point search (1 = exact)
+            sampled: Whether frames only holds every Nth frame already
+            
+        Returns:
+            (max_brightness, frame, frame_number, brightness_sum, point) of
+            the brightest frame; frame is None if no frame is brighter than
+            0, and brightness_sum and point are only kept for stride 1
+        """
+        max_brightness = 0
+        best_frame = None
+        best_number = 0
+        best_sum = None
+        best_point = None
+        free_sums = []  # Sum buffers no longer needed, reused by later scans
+        
+        def reduce(frame_number, frame, out, result):
+            nonlocal max_brightness, best_frame, best_number, best_sum, best_point
+            # A pruned frame hands its unused buffer back
+            max_sum, max_loc, brightness_sum = result if result is not None else (0, None, out)
+            if max_sum / 3.0 > max_brightness:
+                max_brightness = max_sum / 3.0
+                best_frame = frame
+                best_number = frame_number
+                # A decimated sample cannot be reused at full resolution.
+                # Keep the winner's sum and hand the previous winner's
+                # buffer back for reuse, so no buffer is reallocated
+                if stride == 1:
+                    brightness_sum, best_sum = best_sum, brightness_sum
+                    best_point = max_loc
+            if brightness_sum is not None:
+                free_sums.append(brightness_sum)
+        
+        workers = self._frame_workers()
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        pending = collections.deque()
+        try:
+            step = sample_rate if sampled else 1
+            for frame_number, frame in self._track_progress(frames, total_frames, step):
+                # Process only every sample_rate frames
+                if frame_number % sample_rate != 0:
+                    continue
+                
+                sample = frame[::stride, ::stride] if stride > 1 else frame
+                out = free_sums.pop() if free_sums else None
+                if pool is None:
+                    reduce(frame_number, frame, out, self._scan_sample(sample, max_brightness, out))
+                    continue
+                
+                pending.append((frame_number, frame, out,
+                                pool.submit(self._scan_sample, sample, max_brightness, out)))
+                # Keep a few frames in flight per worker, reducing in order
+                if len(pending) >= 2 * workers:
+                    frame_number, frame, out, future = pending.popleft()
+                    reduce(frame_number, frame, out, future.result())
+            
+            while pending:
+                frame_number, frame, out, future = pending.popleft()
+                reduce(frame_number, frame, out, future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        return max_brightness, best_frame, best_number, best_sum, best_point
+    
+    def _rank_downscaled_frames(self, frames, total_frames, sample_rate, sampled=False):
+        """
+        Rank every sample_rate-th frame by its brightness at 1/4 resolution
+        
+        First pass of the "two_pass" video analysis. Area averaging can
+        hide a bright spot smaller than a few pixels, so the result is
+        approximate: the brightest frame is only found if its spot
+        survives downscaling well enough to rank it among the candidates.
+        
+        Args:
+            frames: Iterable of frames
+            total_frames: Number of frames, for progress reporting
+            sample_rate: Rank only every Nth frame
+            sampled: Whether frames only holds every Nth frame already
+            
+        Returns:
+            Frame numbers of the "two_pass_candidates" highest ranked frames
+        """
+        count = max(1, self.config.get("two_pass_candidates", 16))
+        heap = []  # (max_sum, -frame_number), smallest first
+        step = sample_rate if sampled else 1
+        for frame_number, frame in self._track_progress(frames, total_frames, step):
+            # Process only every sample_rate frames
+            if frame_number % sample_rate != 0:
+                continue
+            
+            small = cv2.resize(frame, None, fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA)
+            # On equal sums the later frame is dropped first
+            entry = (self._max_channel_sum(small), -frame_number)
+            if len(heap) < count:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        
+        return sorted(-frame_number for _, frame_number in heap)
+    
+    def _scan_candidates(self, video_capture, candidates):
+        """
+        Find the brightest of the given frames at full resolution
+        
+        Second pass of the "two_pass" video analysis. Each candidate is
+        read by seeking the capture to it; frames that cannot be read are
+        skipped.
+        
+        Args:
+            video_capture: OpenCV VideoCapture object
+            candidates: Frame numbers in ascending order
+            
+        Returns:
+            (max_brightness, frame, frame_number, brightness_sum, point) of
+            the brightest frame, like _scan_frames
+        """
+        max_brightness = 0
+        best = (None, 0, None, None)
+        for frame_number in candidates:
+            video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            ret, frame = video_capture.read()
+            if not ret:
+                continue
+            
+            result = self._scan_sample(frame, max_brightness)
+            # Strictly brighter only, so ties go to the earliest frame
+            if result is not None and result[0] / 3.0 > max_brightness:
+                max_sum, max_loc, brightness_sum = result
+                max_brightness = max_sum / 3.0
+                best = (frame, frame_number, brightness_sum, max_loc)
+        
+        frame, frame_number, brightness_sum, point = best
+        return max_brightness, frame, frame_number, brightness_sum, point
+    
+    def _track_progress(self, frames, total_frames, step=1):
+        """
+        Enumerate frames, updating progress as they are consumed
+        
+        The frame number at which the next percentage is reached is
+        computed ahead, so progress is only touched about 100 times per
+        video instead of once per frame.
+        
+        Args:
+            frames: Iterable of frames
+            total_frames: Number of frames; progress is not reported if it
+                is unknown (0)
+            step: Frame number step between consecutive frames, for frames
+                that only hold every Nth frame
+            
+        Yields:
+            (frame_number, frame)
+        """
+        next_update = 0 if total_frames > 0 else float('inf')
+        for index, frame in enumerate(frames):
+            frame_number = index * step
+            if frame_number >= next_update:
+                percent = min(100, frame_number * 100 // total_frames)
+                self.progress = percent
+                # First frame number of the next percentage
+                next_update = -(-(percent + 1) * total_frames // 100)
+            yield frame_number, frame
+    
+    def _queued_frames(self, frame_queue):
+        """
+        Yield frames from a queue filled by a reader until the video ends
+        
+        Raises:
+            Exception: The error a reader queued when decoding failed
+        """
+        while True:
+            frame = frame_queue.get()
+            if frame is None:  # End of video
+                return
+            if isinstance(frame, Exception):
+                raise frame
+            yield frame
+    
+    def _read_frames(self, video_capture, frame_queue, stop_event, sample_rate=1):
+        """
+        Read every sample_rate-th frame of a video into a queue
+        
+        The frames in between are only grabbed: the decoder advances past
+        them, but they are never converted to BGR or copied out.
+        
+        Args:
+            video_capture: OpenCV VideoCapture object
+            frame_queue: Queue receiving decoded frames, then None at the end
+            stop_event: Event signalling the reader to stop early
+            sample_rate: Queue only every Nth frame
+        """
+        try:
+            while not stop_event.is_set():
+                ret, frame = video_capture.read()
+                
+                if not ret:  # End of video
+                    break
+                
+                frame_queue.put(frame)
+                
+                # Skip to the next sampled frame
+                for _ in range(sample_rate - 1):
+                    if not video_capture.grab():
+                        return
+        finally:
+            frame_queue.put(None)
+    
+    def _read_ffmpeg_frames(self, file_path, frame_queue, stop_event, sample_rate=1):
+        """
+        Read frames from a video file decoded by an FFmpeg subprocess
+        
+        FFmpeg decodes into a pipe in its own process, so decoding keeps
+        running while this process scans earlier frames. Frames are BGR,
+        like those of cv2.VideoCapture.
+        
+        Args:
+            file_path: Path of the video file
+            frame_queue: Queue receiving decoded frames, then None at the end.
+                A decoding error is queued before the None, so the consumer
+                raises it instead of returning a partial result
+            stop_event: Event signalling the reader to stop early
+            sample_rate: Queue only every Nth frame
+        """
+        reader = None
+        try:
+            reader = imageio_ffmpeg.read_frames(file_path, pix_fmt="bgr24")
+            meta = next(reader)
+            width, height = meta["size"]
+            
+            for frame_number, raw in enumerate(reader):
+                if stop_event.is_set():
+                    break
+                if frame_number % sample_rate != 0:
+                    continue
+                frame_queue.put(np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 3))
+        except Exception as e:
+            logger.error(f"Error reading video with FFmpeg: {e}")
+            frame_queue.put(e)
+        finally:
+            if reader is not None:
+                reader.close()
+            frame_queue.put(None)
+    
     def analyze_gif(self, frames, sample_rate=1):
         """
         Analyze a GIF to find the brightest point across all frames
         
         Args:
-            frames: List of numpy arrays containing the GIF frames
+            frames: List of numpy arrays containing the GIF frames, or a
+                single (N, H, W[, C]) array of them
             sample_rate: Sample every N frames for better performance
             
         Returns:
@@ -329,40 +960,42 @@ class BrightnessAnalyzer:
         global_max_brightness = 0
         global_brightest_point = (0, 0)
         global_brightest_frame = None
+        global_brightness_sum = None
+        winner_point = None
         global_frame_number = 0
+        stride = self.config.get("search_stride", 1)
+        sampled_frames = frames[::sample_rate]
+        batch_limit = self.config.get("gif_batch_max_bytes", 64 * 1024 * 1024)
         
-        # Process each frame in the GIF
-        for frame_number, frame in enumerate(frames):
-            # Update progress
-            self.progress = int((frame_number / total_frames) * 100)
-            
-            # Process only every sample_rate frames
-            if frame_number % sample_rate == 0:
-                # Calculate brightness
-                brightness = self.calculate_brightness(frame)
-                
-                # Find max brightness in this frame
-                max_brightness = np.max(brightness)
-                
-                # If brighter than previous max, update
-                if max_brightness > global_max_brightness:
-                    global_max_brightness = max_brightness
-                    global_brightest_point = self.find_brightest_point(brightness)
-                    global_brightest_frame = frame.copy()
-                    global_frame_number = frame_number
+        # The batched ranking runs in NumPy, so it is skipped when frames
+        # are reduced on the OpenCL device
+        if (stride == 1 and not self._opencl_enabled() and
+                len({frame.shape for frame in sampled_frames}) == 1 and
+                sum(frame.nbytes for frame in sampled_frames) <= batch_limit):
+            # Small GIF with uniform frames: rank all sampled frames at once
+            index, global_max_brightness = self._find_brightest_frame_batched(sampled_frames)
+            if index is not None:
+                global_brightest_frame = sampled_frames[index].copy()
+                global_frame_number = index * sample_rate
+            self.progress = 100
+        else:
+            # Frames are independent, so they are scanned on the frame
+            # workers; only the winner is copied out of the caller's list
+            (global_max_brightness, global_brightest_frame, global_frame_number,
+             global_brightness_sum, winner_point) = self._scan_frames(
+                frames, total_frames, sample_rate, stride)
+            if global_brightest_frame is not None:
+                global_brightest_frame = global_brightest_frame.copy()
         
         # Calculate average brightness around brightest point
         if global_brightest_frame is not None:
-            brightness = self.calculate_brightness(global_brightest_frame)
-            average_brightness = self.calculate_average_brightness(
-                brightness, 
-                global_brightest_point,
-                radius=self.config.get("average_area_size", 10)
+            (global_max_brightness, global_brightest_point,
+             average_brightness, histogram) = self._summarize_brightness(
+                global_brightest_frame,
+                global_brightness_sum,
+                winner_point
             )
             
-            # Calculate histogram for the brightest frame
-            histogram = self.calculate_histogram(brightness)
-            
             # Create marked image for visualization
             brightest_frame_marked = self.draw_markers(
                 global_brightest_frame.copy(),
@@ -396,6 +1029,49 @@ class BrightnessAnalyzer:
             }
         }
     
+    def _find_brightest_frame_batched(self, frames):
+        """
+        Find the brightest of a list of equally shaped frames
+        
+        The frames are stacked into one (N, H, W[, C]) array so the upper
+        bound of every frame comes from a single vectorized reduction. The
+        exact maximum of the frame with the highest bound is a lower bound
+        for the winner, so only frames whose upper bound reaches it are
+        candidates. Their exact channel sums are then reduced together in
+        uint16, without a Python loop over frames.
+        
+        Args:
+            frames: List of numpy arrays with identical shapes, or an
+                already stacked (N, H, W[, C]) array
+            
+        Returns:
+            (index, max_brightness) of the first brightest frame, or
+            (None, 0) if every frame is black
+        """
+        stack = frames if isinstance(frames, np.ndarray) else np.stack(frames)
+        upper_bounds = stack.reshape(len(frames), -1).max(axis=1).astype(np.int64)
+        
+        if stack.ndim == 3:  # Grayscale frames: the bound is exact
+            max_sums = upper_bounds * 3
+        else:
+            lower_bound = self._max_channel_sum(stack[int(np.argmax(upper_bounds))])
+            candidates = np.flatnonzero(upper_bounds * 3 >= lower_bound)
+            subset = stack if len(candidates) == len(frames) else stack[candidates]
+            
+            # Exact R + G + B of every candidate (max 765 fits in uint16)
+            sums = np.add(subset[..., 0], subset[..., 1], dtype=np.uint16)
+            sums += subset[..., 2]
+            max_sums = np.zeros(len(frames), dtype=np.int64)
+            max_sums[candidates] = sums.reshape(len(candidates), -1).max(axis=1)
+        
+        # argmax returns the first maximum, so ties go to the earliest
+        # frame as in the sequential scan
+        best_index = int(np.argmax(max_sums))
+        best_sum = int(max_sums[best_index])
+        if best_sum == 0:
+            return None, 0.0
+        return best_index, best_sum / 3.0
+    
     def draw_markers(self, image, point, max_brightness, avg_brightness):
         """
         Draw markers on the image to highlight the brightest point
@@ -3,11 +3,37 @@ Camera module for OpenCV-based camera access on non-Raspberry Pi systems
 """
 
 import os
+import math
 import time
 import cv2
 import numpy as np
 from datetime import datetime
 
+try:
+    # Optional JIT compiler for the simulated frame kernel
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Serial on purpose: the analyzer's parallel kernels may be running on
+    # another thread, and Numba's default workqueue threading layer aborts
+    # the process when two parallel kernels are launched at once
+    @njit(fastmath=True, cache=True)
+    def _fill_sim_frame(buf, t, brightness_factor):
+        """Fill buf with the simulated background pattern in a single pass"""
+        height, width = buf.shape[0], buf.shape[1]
+        for y in range(height):
+            row_term = math.cos(y * 0.01 + t * 1.5)
+            for x in range(width):
+                value = (math.sin(x * 0.01 + t) + row_term) * 20 + 128
+                gray = np.uint8(min(255.0, max(0.0, value * brightness_factor)))
+                buf[y, x, 0] = gray
+                buf[y, x, 1] = gray
+                buf[y, x, 2] = gray
+
 
 class CVCamera:
     """OpenCV camera implementation for non-Raspberry Pi systems"""
@@ -21,12 +47,15 @@ class CVCamera:
         self.stream_active = False
         self.recording = False
         self.video_writer = None
+        self._bgr_buf = None  # Reusable RGB->BGR conversion buffer
+        self._rgb_buf = None  # Reusable BGR->RGB buffer for preview frames
         
         # Simulation mode
         self.simulation_mode = os.environ.get('SIMULATION_MODE', 'False').lower() == 'true'
         self.sim_frame_count = 0
         self.sim_brightness = 50
         self.sim_contrast = 0
+        self._update_sim_grid()
         
     def list_cameras(self):
         """List available camera devices"""
@@ -57,10 +86,15 @@ class CVCamera:
             
         return available_cameras
     
+    def _update_sim_grid(self):
+        """Precompute the pixel coordinate grid used by the simulated frames"""
+        width, height = self.resolution
+        self._xs = np.arange(width, dtype=np.float32)
+        self._ys = np.arange(height, dtype=np.float32)[:, None]
+    
     def _create_simulated_frame(self):
         """Create a simulated camera frame with patterns"""
         width, height = self.resolution
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
         
         # Create a moving gradient
         t = self.sim_frame_count / 30.0  # Time variable
@@ -70,21 +104,19 @@ class CVCamera:
         center_y = int(height/2 + height/4 * np.cos(t * 0.7))
         radius = 50 + 20 * np.sin(t * 2)
         
-        # Draw background gradient
-        for y in range(height):
-            for x in range(width):
-                # Create moving patterns
-                pattern = (np.sin(x * 0.01 + t) + np.cos(y * 0.01 + t * 1.5)) * 20 + 128
-                
-                # Apply brightness and contrast
-                brightness_factor = self.sim_brightness / 50.0  # 0 to 2
-                contrast_factor = (self.sim_contrast + 100) / 100.0  # 0 to 2
-                
-                r = max(0, min(255, pattern * brightness_factor))
-                g = max(0, min(255, pattern * brightness_factor))
-                b = max(0, min(255, pattern * brightness_factor))
-                
-                frame[y, x] = [r, g, b]
+        # Apply brightness
+        brightness_factor = self.sim_brightness / 50.0  # 0 to 2
+        
+        if NUMBA_AVAILABLE:
+            # Compiled kernel writes the pattern without temporaries
+            frame = np.empty((height, width, 3), dtype=np.uint8)
+            _fill_sim_frame(frame, t, brightness_factor)
+        else:
+            # Draw background gradient, broadcasting the row and column terms
+            # over the whole (height, width) grid
+            pattern = (np.sin(self._xs * 0.01 + t) + np.cos(self._ys * 0.01 + t * 1.5)) * 20 + 128
+            gray = np.clip(pattern * brightness_factor, 0, 255).astype(np.uint8)
+            frame = np.broadcast_to(gray[:, :, None], (height, width, 3)).copy()
         
         # Draw the circle with increased brightness
         cv2.circle(frame, (center_x, center_y), int(radius), (200, 230, 255), -1)
@@ -177,7 +209,13 @@ class CVCamera:
             pass  # No special actions needed to stop OpenCV camera stream
     
     def get_frame(self):
-        """Get the next frame from the camera"""
+        """
+        Get the next frame from the camera
+        
+        The returned RGB frame lives in a buffer that is reused by the next
+        call, so callers that keep a frame must copy it (capture_image
+        always returns a fresh array).
+        """
         if not self.stream_active:
             return None
             
@@ -195,8 +233,10 @@ class CVCamera:
             self.simulation_mode = True
             return self._create_simulated_frame()
         
-        # Convert BGR to RGB for display
-        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Convert BGR to RGB for display into the reusable buffer
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
     
     def capture_image(self):
         """Capture a still image"""
@@ -238,7 +278,7 @@ class CVCamera:
         
         # Convert RGB to BGR for OpenCV
         if len(image.shape) == 3 and image.shape[2] == 3:
-            bgr_image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+            bgr_image = self._to_bgr(image)
         else:
             bgr_image = image
         
@@ -315,8 +355,7 @@ class CVCamera:
                 for _ in range(30):  # Add 1 second of footage
                     frame = self._create_simulated_frame()
                     # Convert RGB to BGR for OpenCV
-                    bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    self.video_writer.write(bgr_frame)
+                    self.video_writer.write(self._to_bgr(frame))
             
             self.video_writer.release()
             self.video_writer = None
@@ -326,6 +365,7 @@ class CVCamera:
     def set_resolution(self, resolution):
         """Set camera resolution"""
         self.resolution = resolution
+        self._update_sim_grid()
         
         if self.simulation_mode:
             return True
@@ -383,7 +423,15 @@ class CVCamera:
         if self.recording and self.video_writer is not None:
             # Convert RGB to BGR for OpenCV
             if len(frame.shape) == 3 and frame.shape[2] == 3:
-                bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                bgr_frame = self._to_bgr(frame)
             else:
                 bgr_frame = frame
             self.video_writer.write(bgr_frame)
+    
+    def _to_bgr(self, image):
+        """Convert an RGB image to BGR in a buffer reused across calls"""
+        if self._bgr_buf is None or self._bgr_buf.shape != image.shape:
+            self._bgr_buf = np.empty_like(image)
+        
+        cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=self._bgr_buf)
+        return self._bgr_buf
@@ -0,0 +1,108 @@
+"""
+Frame hand-off between a capture thread and a consumer
+"""
+
+import threading
+import numpy as np
+
+try:
+    # Optional Cython lock, cheaper than threading.Lock on the frame path
+    from fastrlock.rlock import FastRLock
+    FASTRLOCK_AVAILABLE = True
+except ImportError:
+    FASTRLOCK_AVAILABLE = False
+
+
+class FrameRing:
+    """
+    Preallocated ring of frames shared by one producer and one consumer
+    
+    The producer copies each frame into a slot that is neither the pending
+    frame nor the one the consumer holds, then publishes it. The consumer
+    always takes the newest complete frame, so neither side waits for the
+    other and frames are never torn. With the default three slots this is
+    a triple buffer. The lock only guards a few reference swaps; the copy
+    itself runs outside it.
+    """
+    
+    def __init__(self, slots=3):
+        self._slots = [None] * slots
+        self._latest = None  # Published frame not taken yet
+        self._held = None  # Frame last handed to the consumer
+        self._last = None  # Most recently published frame
+        self._lock = FastRLock() if FASTRLOCK_AVAILABLE else threading.Lock()
+        self._published = threading.Event()
+    
+    def write(self, source):
+        """
+        Copy source into a free slot (producer side)
+        
+        Args:
+            source: Array to copy
+            
+        Returns:
+            The slot written, to be passed to publish
+        """
+        # Anything the consumer can take before publish is already one of
+        # these two, so the chosen slot stays free while it is written
+        with self._lock:
+            busy = (self._latest, self._held)
+        
+        index = next(i for i, buf in enumerate(self._slots)
+                     if buf is None or all(buf is not b for b in busy))
+        buf = self._slots[index]
+        if buf is None or buf.shape != source.shape or buf.dtype != source.dtype:
+            buf = np.empty(source.shape, dtype=source.dtype)
+            self._slots[index] = buf
+        np.copyto(buf, source)
+        return buf
+    
+    def publish(self, frame):
+        """Make a written slot the newest frame, replacing any not taken yet"""
+        with self._lock:
+            self._latest = frame
+            self._last = frame
+        self._published.set()
+    
+    def take(self):
+        """
+        Take the newest frame without blocking (consumer side)
+        
+        Returns:
+            The frame, or None if none was published since the last take.
+            It stays valid until the next take or wait.
+        """
+        with self._lock:
+            frame = self._latest
+            self._latest = None
+            if frame is not None:
+                self._held = frame
+        return frame
+    
+    def wait(self, timeout):
+        """
+        Wait for a frame published after this call (consumer side)
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            The newest frame, or None if none arrived in time
+        """
+        self._published.clear()
+        if not self._published.wait(timeout):
+            return None
+        
+        # The last published frame is always the pending or the held one,
+        # so the producer is not writing to it
+        with self._lock:
+            self._latest = None
+            self._held = self._last
+            return self._held
+    
+    def clear(self):
+        """Drop published frames, keeping the slots for reuse"""
+        with self._lock:
+            self._latest = None
+            self._held = None
+            self._last = None
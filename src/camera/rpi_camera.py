@@ -4,25 +4,52 @@ Camera module for Raspberry Pi camera access using picamera2
 
 import os
 import time
+import queue
 import threading
 import cv2
 import numpy as np
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from camera.frame_ring import FrameRing
 
 try:
     # Import picamera2 for Raspberry Pi
-    from picamera2 import Picamera2
+    from picamera2 import Picamera2, MappedArray
     from picamera2.encoders import H264Encoder, MJPEGEncoder
-    from picamera2.outputs import FfmpegOutput
+    from picamera2.outputs import FfmpegOutput, FileOutput
     PICAMERA_AVAILABLE = True
 except ImportError:
     PICAMERA_AVAILABLE = False
     print("Warning: picamera2 not available. RPi camera features will be limited.")
 
+try:
+    # libjpeg-turbo bindings (installed alongside picamera2), encode RGB
+    # JPEGs without a BGR conversion
+    import simplejpeg
+    SIMPLEJPEG_AVAILABLE = True
+except ImportError:
+    SIMPLEJPEG_AVAILABLE = False
+
+try:
+    # Newer picamera2 releases allocate frame buffers as CMA dma-bufs
+    from picamera2.allocators import DmaAllocator
+    DMA_ALLOCATOR_AVAILABLE = True
+except ImportError:
+    DMA_ALLOCATOR_AVAILABLE = False
+
+try:
+    # Newer picamera2 releases mux MP4 in-process with PyAV
+    from picamera2.outputs import PyavOutput
+    PYAV_OUTPUT_AVAILABLE = True
+except ImportError:
+    PYAV_OUTPUT_AVAILABLE = False
+
 
 class RPiCamera:
     """Raspberry Pi camera implementation using picamera2"""
     
+    # Camera names from the last hardware probe, shared by all instances
+    _cam_info_cache = None
+    
     def __init__(self, config):
         """Initialize the camera with configuration"""
         self.config = config
@@ -33,6 +60,21 @@ class RPiCamera:
         self.video_writer = None  # For OpenCV-based recording fallback
         self.recording_path = None
         self.using_picamera_recording = False  # Flag to track recording mode
+        self._bgr_buf = None  # Reusable RGB->BGR conversion buffer
+        self._io_pool = None  # Background image writer, created on first save
+        self._control_overrides = {}  # Runtime control values, not saved to config
+        self.native_bgr = False  # True when streamed frames are in BGR order
+        self._flush_thread = None  # Finishes a picamera2 recording in the background
+        
+        # OpenCV fallback recording: frames are written on a separate thread
+        self._writer_q = None  # Converted frames waiting to be written
+        self._free_bufs = None  # Preallocated BGR buffers not in use
+        self._writer_thread = None
+        
+        # Frames published by the capture thread (triple buffer)
+        self._frame_ring = FrameRing()
+        self._stop_evt = threading.Event()
+        self._producer = None
         
         # Try to initialize the camera
         self._init_camera()
@@ -46,38 +88,74 @@ class RPiCamera:
         
         try:
             self.camera = Picamera2()
+            self._use_dma_buffers()
             
             # Configure the camera for video recording
-            config = self.camera.create_video_configuration(
-                main={"size": self.resolution},
-                lores={"size": (640, 480)},
-                display="lores"
-            )
-            self.camera.configure(config)
-            
-            # Set camera controls based on config
-            self.set_brightness(self.config.get("brightness", 50))
-            self.set_contrast(self.config.get("contrast", 0))
-            
-            # Set rotation if needed
-            rotation = self.config.get("rotation", 0)
-            if rotation > 0:
-                self.camera.set_controls({"RotationDegrees": rotation})
+            self.camera.configure(self._create_config())
+            self._apply_initial_controls()
             
         except Exception as e:
             print(f"Error initializing RPi camera: {e}")
             self.camera = None
     
+    def _use_dma_buffers(self):
+        """Map frame buffers as dma-bufs when the installed picamera2 supports it"""
+        if DMA_ALLOCATOR_AVAILABLE:
+            self.camera.allocator = DmaAllocator()
+    
+    def _create_config(self):
+        """
+        Create the streaming configuration for the current resolution
+        
+        The main stream uses packed 24-bit "BGR888", which picamera2 stores
+        in R, G, B byte order: the RGB layout the rest of the application
+        expects, at 3 bytes per pixel instead of the 4 of the default
+        XBGR8888. The preview (lores) stream uses YUV420 at 1.5 bytes per
+        pixel.
+        
+        The number of buffers comes from the "buffer_count" setting: more
+        buffers absorb longer consumer stalls without dropping frames,
+        fewer buffers lower latency and memory use (each one holds a full
+        main frame). Completed frames are queued so a capture can return
+        one that has already arrived instead of waiting for the next.
+        
+        Setting "main_format" to "RGB888" streams B, G, R bytes instead.
+        native_bgr is then set, so recording writes frames without a color
+        conversion and the preview displays them as BGR.
+        
+        Brightness and contrast are part of the configuration, so they are
+        applied by configure without a separate set_controls call and are
+        kept when the resolution changes.
+        
+        Returns:
+            picamera2 camera configuration
+        """
+        main_format = self.config.get("main_format", "BGR888")
+        self.native_bgr = main_format == "RGB888"
+        return self.camera.create_video_configuration(
+            main={"size": self.resolution, "format": main_format},
+            lores={"size": (640, 480), "format": "YUV420"},
+            display="lores",
+            buffer_count=self.config.get("buffer_count", 6),
+            queue=True,
+            controls=self._control_values()
+        )
+    
     def list_cameras(self):
         """List available camera devices"""
         if not PICAMERA_AVAILABLE:
             return []
         
+        # Cameras cannot be hot-plugged, so probe the hardware only once
+        if RPiCamera._cam_info_cache is not None:
+            return list(RPiCamera._cam_info_cache)
+        
         try:
             # Get a list of available cameras
             cameras = Picamera2.global_camera_info()
-            return [f"Camera {i} ({camera.get('Model', 'Unknown')})" 
-                   for i, camera in enumerate(cameras)]
+            RPiCamera._cam_info_cache = [f"Camera {i} ({camera.get('Model', 'Unknown')})" 
+                                         for i, camera in enumerate(cameras)]
+            return list(RPiCamera._cam_info_cache)
         except Exception as e:
             print(f"Error listing cameras: {e}")
             return ["Default RPi Camera"]
@@ -94,37 +172,47 @@ class RPiCamera:
             
             # Initialize new camera with index
             self.camera = Picamera2(camera_index)
+            self._use_dma_buffers()
             
             # Configure the camera for video recording
-            config = self.camera.create_video_configuration(
-                main={"size": self.resolution},
-                lores={"size": (640, 480)},
-                display="lores"
-            )
-            self.camera.configure(config)
-            
-            # Apply settings
-            self.set_brightness(self.config.get("brightness", 50))
-            self.set_contrast(self.config.get("contrast", 0))
+            self.camera.configure(self._create_config())
+            self._apply_initial_controls()
             
             return True
         except Exception as e:
             print(f"Error selecting camera: {e}")
             return False
     
+    def _ensure_camera(self):
+        """
+        Initialize the camera on first use
+        
+        Returns:
+            True if a configured camera is available
+        """
+        if self.camera is None:
+            self._init_camera()
+        return self.camera is not None
+    
     def start_stream(self):
         """Start camera stream"""
-        if not self.camera:
-            self._init_camera()
-        
-        if not self.camera:
+        if not self._ensure_camera():
             print("[DEBUG] rpi_camera.py: start_stream failed, camera is not available")
             return False
         
+        if self.stream_active:
+            return True
+        
         try:
             # Start the camera
             self.camera.start()
             self.stream_active = True
+            
+            # Capture continuously on a background thread so get_frame
+            # never blocks the UI for a sensor frame interval
+            self._stop_evt.clear()
+            self._producer = threading.Thread(target=self._producer_loop, daemon=True)
+            self._producer.start()
             print("[DEBUG] rpi_camera.py: start_stream succeeded")
             return True
         except Exception as e:
@@ -138,59 +226,178 @@ class RPiCamera:
         if not self.camera or not self.stream_active:
             return
         
+        # Stop the capture thread before the camera it reads from
+        self._stop_evt.set()
+        if self._producer is not None:
+            self._producer.join(timeout=1.0)
+            self._producer = None
+        
         try:
             self.camera.stop()
             self.stream_active = False
         except Exception as e:
             print(f"Error stopping stream: {e}")
+        
+        self._frame_ring.clear()
     
-    def get_frame(self):
-        """Get the latest frame from the camera"""
-        if not self.camera or not self.stream_active:
-            return None
+    def _producer_loop(self):
+        """Capture frames continuously and publish the most recent one"""
+        while not self._stop_evt.is_set():
+            try:
+                frame = self._capture_into_ring()
+            except Exception as e:
+                if self._stop_evt.is_set():
+                    break
+                print(f"Error capturing frame: {e}")
+                self._stop_evt.wait(0.1)
+                continue
+            
+            # Replace any frame the consumer has not picked up yet
+            self._frame_ring.publish(frame)
+    
+    def _capture_into_ring(self):
+        """
+        Copy the next completed request into the frame ring
+        
+        The request buffer is copied once into a preallocated array and
+        released right away, so the camera gets its buffer back without a
+        fresh allocation per frame. FrameRing never hands out a slot while
+        it is being written, so frames are passed on without copies or races.
         
+        Returns:
+            The ring array holding the new frame
+        """
+        request = self.camera.capture_request()
         try:
-            # capture_array is a blocking call, which is what we want
-            # for the QTimer-based update mechanism.
-            return self.camera.capture_array("main")
-        except Exception as e:
-            print(f"Error capturing frame: {e}")
+            with MappedArray(request, "main") as mapped:
+                frame = self._frame_ring.write(mapped.array)
+        finally:
+            request.release()
+        
+        return frame
+    
+    def get_frame(self):
+        """
+        Get the latest frame from the camera without blocking
+        
+        Returns None if no new frame has arrived since the previous call.
+        The frame stays valid until the next get_frame or wait_for_frame
+        call; callers that keep it longer must copy it.
+        """
+        # The stream is only active once the camera is configured and started
+        if not self.stream_active:
             return None
+        
+        return self._frame_ring.take()
+    
+    def wait_for_frame(self, timeout=1.0):
+        """
+        Wait for the next frame captured after this call
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            The new frame, or None if none arrived in time
+        """
+        return self._frame_ring.wait(timeout)
     
     def capture_image(self):
         """Capture a still image"""
-        if not self.camera:
-            self._init_camera()
-        
-        if not self.camera:
+        if not self._ensure_camera():
             raise Exception("Camera is not available")
         
         try:
-            # Capture a new array directly. This ensures we get a fresh frame.
-            return self.camera.capture_array("main")
+            # While streaming, take the next frame from the capture thread
+            # so two threads never call capture_array at the same time
+            if self._producer is not None and self._producer.is_alive():
+                frame = self.wait_for_frame()
+                if frame is None:
+                    return None
+                from_ring = True
+            else:
+                # Capture a new array directly. This ensures we get a fresh frame.
+                frame = self.camera.capture_array("main")
+                from_ring = False
+            
+            # Captures are always RGB; the conversion also copies the frame
+            # out of the ring, since the capture is kept by callers
+            if self.native_bgr:
+                return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            return frame.copy() if from_ring else frame
         except Exception as e:
             print(f"Error capturing image: {e}")
             return None
     
     def save_image(self, image, file_path):
-        """Save image to file"""
+        """
+        Save image to file
+        
+        Arrays are encoded and written on a background thread, so the
+        returned future is the only place a failed write is reported.
+        
+        Returns:
+            concurrent.futures.Future resolving to the file path once the
+            image is written
+        """
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
-        # Save the image
+        # Save the image on the I/O thread so JPEG/PNG encoding does not
+        # block the caller. A single worker keeps the BGR buffer private
         if isinstance(image, np.ndarray):
-            cv2.imwrite(file_path, cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=1)
+            future = self._io_pool.submit(self._do_save, image, file_path)
+            future.add_done_callback(self._on_save_done)
         else:
             # If it's a direct output from picamera, save it directly
-            self.camera.capture_file(file_path)
+            future = Future()
+            try:
+                self.camera.capture_file(file_path)
+                future.set_result(file_path)
+            except Exception as e:
+                future.set_exception(e)
         
+        return future
+    
+    def _do_save(self, image, file_path):
+        """Encode and write an RGB image, returning the file path"""
+        is_jpeg = file_path.lower().endswith((".jpg", ".jpeg"))
+        if (SIMPLEJPEG_AVAILABLE and is_jpeg and image.ndim == 3
+                and image.shape[2] == 3):
+            # Same quality and chroma subsampling as cv2.imwrite's defaults
+            data = simplejpeg.encode_jpeg(np.ascontiguousarray(image), quality=95,
+                                          colorspace="RGB", colorsubsampling="420")
+            with open(file_path, "wb") as f:
+                f.write(data)
+        else:
+            # Convert RGB to BGR for OpenCV
+            if not cv2.imwrite(file_path, self._to_bgr(image)):
+                raise IOError(f"Could not write image: {file_path}")
         return file_path
     
+    def _on_save_done(self, future):
+        """Log a failed background save"""
+        if future.exception() is not None:
+            print(f"Error saving image: {future.exception()}")
+    
+    def _to_bgr(self, image):
+        """Convert an RGB image to BGR in a buffer reused across calls"""
+        if self._bgr_buf is None or self._bgr_buf.shape != image.shape:
+            self._bgr_buf = np.empty_like(image)
+        
+        cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=self._bgr_buf)
+        return self._bgr_buf
+    
     def start_recording(self, file_path):
         """Start video recording"""
         if not self.camera or self.recording:
             return False
         
+        # The encoder of the previous recording must be fully stopped
+        self._wait_for_flush()
+        
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
@@ -208,13 +415,19 @@ class RPiCamera:
                 # Default to MJPEG for other formats like .avi
                 encoder = MJPEGEncoder()
             
-            # Use FfmpegOutput for robust container handling
-            output = FfmpegOutput(file_path)
+            # Pick the cheapest output for the container: raw H.264 goes
+            # straight to the file, MP4 is muxed in-process when PyAV is
+            # available, and only other cases spawn an ffmpeg process
+            if ext.lower() == '.h264':
+                output = FileOutput(file_path)
+            elif ext.lower() == '.mp4' and PYAV_OUTPUT_AVAILABLE:
+                output = PyavOutput(file_path)
+            else:
+                output = FfmpegOutput(file_path)
             
             # Ensure camera is started before recording
-            if not self.stream_active:
-                self.camera.start()
-                self.stream_active = True
+            if not self.stream_active and not self.start_stream():
+                raise RuntimeError("Could not start camera stream")
             
             # start_recording is a robust, high-level call
             self.camera.start_recording(encoder, output)
@@ -237,25 +450,22 @@ class RPiCamera:
             width, height = self.resolution
             fps = 30
             
-            # Get video format from file extension
-            _, ext = os.path.splitext(file_path)
+            # Create video writer, preferring the hardware H.264 encoder
+            self.video_writer = self._create_video_writer(file_path, fps, (width, height))
             
-            # Choose codec based on extension
-            if ext.lower() == '.mp4':
-                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            elif ext.lower() == '.avi':
-                fourcc = cv2.VideoWriter_fourcc(*'XVID')
-            else:
-                # Default to MP4
-                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            
-            # Create video writer
-            self.video_writer = cv2.VideoWriter(
-                file_path,
-                fourcc,
-                fps,
-                (width, height)
+            # Encode and write on a dedicated thread so a slow disk or
+            # encoder never stalls the capture loop. Two buffers more than
+            # the queue holds: one being written, one being filled
+            self._writer_q = queue.Queue(maxsize=4)
+            self._free_bufs = queue.Queue()
+            for _ in range(self._writer_q.maxsize + 2):
+                self._free_bufs.put(np.empty((height, width, 3), dtype=np.uint8))
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop,
+                args=(self.video_writer, self._writer_q, self._free_bufs),
+                daemon=True
             )
+            self._writer_thread.start()
             
             self.recording = True
             self.using_picamera_recording = False  # Flag to indicate OpenCV recording mode
@@ -266,6 +476,50 @@ class RPiCamera:
             self.recording = False
             return False
     
+    def _create_video_writer(self, file_path, fps, size):
+        """
+        Create an OpenCV video writer, trying hardware encoders first
+        
+        For MP4 the order is: GStreamer with the V4L2 hardware H.264
+        encoder, then the FFmpeg backend with H.264 and hardware
+        acceleration requested, then the software mp4v codec. Backends
+        that are missing from the OpenCV build simply fail to open.
+        
+        Args:
+            file_path: Output video path
+            fps: Frames per second
+            size: (width, height) of the frames
+            
+        Returns:
+            cv2.VideoWriter for the file
+        """
+        # Get video format from file extension
+        _, ext = os.path.splitext(file_path)
+        
+        if ext.lower() == '.avi':
+            return cv2.VideoWriter(file_path, cv2.VideoWriter_fourcc(*'XVID'), fps, size)
+        
+        if ext.lower() == '.mp4':
+            # GStreamer pipeline feeding the VPU encoder
+            pipeline = (
+                "appsrc ! videoconvert ! video/x-raw,format=I420 ! v4l2h264enc ! "
+                f"h264parse ! mp4mux ! filesink location={file_path}"
+            )
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, size, True)
+            if writer.isOpened():
+                return writer
+            
+            # FFmpeg backend; lets OpenCV pick h264_v4l2m2m where available
+            writer = cv2.VideoWriter(
+                file_path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*'avc1'), fps, size,
+                [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            )
+            if writer.isOpened():
+                return writer
+        
+        # Software MPEG-4 as the last resort, and the default for other formats
+        return cv2.VideoWriter(file_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    
     def stop_recording(self):
         """Stop video recording"""
         if not self.recording:
@@ -274,13 +528,32 @@ class RPiCamera:
         try:
             # Stop picamera2 recording if active
             if hasattr(self, 'using_picamera_recording') and self.using_picamera_recording:
-                if self.camera and hasattr(self.camera, 'stop_recording'):
+                if self.camera and hasattr(self.camera, 'stop_encoder'):
+                    # Flushing and closing the output can take hundreds of
+                    # milliseconds, so finish it off the caller's thread.
+                    # Only the encoder stops; the preview keeps streaming
+                    self._flush_thread = threading.Thread(
+                        target=self._stop_encoder,
+                        args=(self.camera,),
+                        daemon=True
+                    )
+                    self._flush_thread.start()
+                elif self.camera:
+                    # Older picamera2 without stop_encoder: stop on this thread
                     try:
                         self.camera.stop_recording()
                         print("[DEBUG] picamera2 recording stopped")
                     except Exception as e:
                         print(f"Error stopping picamera2 recording: {e}")
             else:
+                # Let the writer thread flush queued frames, then stop it
+                if self._writer_thread is not None:
+                    self._writer_q.put(None)
+                    self._writer_thread.join()
+                    self._writer_thread = None
+                    self._writer_q = None
+                    self._free_bufs = None
+                
                 # Stop OpenCV recording if active
                 if self.video_writer is not None:
                     self.video_writer.release()
@@ -295,6 +568,35 @@ class RPiCamera:
             print(f"Error stopping recording: {e}")
             return False
     
+    def _stop_encoder(self, camera):
+        """Stop the picamera2 encoder and close its output"""
+        try:
+            camera.stop_encoder()
+            print("[DEBUG] picamera2 recording stopped")
+        except Exception as e:
+            print(f"Error stopping picamera2 recording: {e}")
+    
+    def _wait_for_flush(self):
+        """Wait until a recording stopped in the background is finished"""
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+    
+    def _writer_loop(self, video_writer, writer_q, free_bufs):
+        """Write queued frames until the None sentinel arrives"""
+        while True:
+            frame = writer_q.get()
+            if frame is None:
+                break
+            
+            try:
+                video_writer.write(frame)
+            except Exception as e:
+                print(f"Error writing video frame: {e}")
+            
+            # Hand the buffer back for the next frame
+            free_bufs.put(frame)
+    
     def write_video_frame(self, frame):
         """Write a frame to the video file if recording is active."""
         if not self.recording:
@@ -304,13 +606,30 @@ class RPiCamera:
             # Only write frames manually if using OpenCV recording (fallback mode)
             # For picamera2 recording, frames are automatically written by the camera
             if hasattr(self, 'using_picamera_recording') and not self.using_picamera_recording:
-                if self.video_writer is not None:
-                    # Convert RGB to BGR for OpenCV
-                    if len(frame.shape) == 3 and frame.shape[2] == 3:
-                        bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                if self._writer_q is not None:
+                    # Take a free buffer; if the writer has fallen behind,
+                    # drop the oldest queued frame and reuse its buffer
+                    try:
+                        buf = self._free_bufs.get_nowait()
+                    except queue.Empty:
+                        buf = self._writer_q.get_nowait()
+                    
+                    if buf.shape != frame.shape:
+                        buf = np.empty_like(frame)
+                    
+                    # Convert RGB to BGR for OpenCV, unless the camera
+                    # already streams BGR frames
+                    if not self.native_bgr and len(frame.shape) == 3 and frame.shape[2] == 3:
+                        cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=buf)
                     else:
-                        bgr_frame = frame
-                    self.video_writer.write(bgr_frame)
+                        np.copyto(buf, frame)
+                    
+                    try:
+                        self._writer_q.put_nowait(buf)
+                    except queue.Full:
+                        # Still full: drop the oldest frame to make room
+                        self._free_bufs.put(self._writer_q.get_nowait())
+                        self._writer_q.put_nowait(buf)
             else:
                 # For picamera2 recording, frames are handled automatically
                 # No manual frame writing needed
@@ -325,6 +644,10 @@ class RPiCamera:
             self.resolution = resolution
             return False
         
+        # Reconfiguring flushes the whole pipeline, so skip no-op changes
+        if tuple(resolution) == tuple(self.resolution):
+            return True
+        
         try:
             # Need to reconfigure camera for resolution change
             streaming = self.stream_active
@@ -336,16 +659,14 @@ class RPiCamera:
             if recording:
                 self.stop_recording()
             
+            # The encoder must be fully stopped before reconfiguring
+            self._wait_for_flush()
+            
             # Update resolution
             self.resolution = resolution
             
             # Reconfigure
-            config = self.camera.create_video_configuration(
-                main={"size": self.resolution},
-                lores={"size": (640, 480)},
-                display="lores"
-            )
-            self.camera.configure(config)
+            self.camera.configure(self._create_config())
             
             # Restart if needed
             if streaming:
@@ -356,46 +677,87 @@ class RPiCamera:
             print(f"Error setting resolution: {e}")
             return False
     
-    def set_brightness(self, value):
-        """Set camera brightness"""
+    def _apply_controls(self, **overrides):
+        """
+        Apply brightness, contrast and rotation in a single set_controls call
+        
+        Args:
+            overrides: Values to change first (brightness, contrast,
+                rotation), in the same units as the config. They are kept
+                on the camera and do not modify the config
+            
+        Returns:
+            True if the controls were applied
+        """
+        self._control_overrides.update(overrides)
+        
         if not self.camera:
             return False
         
+        controls = self._control_values()
+        
+        # Set rotation if needed
+        rotation = self._control_settings().get("rotation", 0)
+        if rotation > 0:
+            controls["RotationDegrees"] = rotation
+        
         try:
-            # Convert 0-100 to -1.0 to 1.0
-            normalized = (value - 50) / 50.0
-            
-            # Set brightness
-            self.camera.set_controls({"Brightness": normalized})
+            self.camera.set_controls(controls)
             return True
         except Exception as e:
-            print(f"Error setting brightness: {e}")
+            print(f"Error setting camera controls: {e}")
             return False
     
+    def _apply_initial_controls(self):
+        """Apply the controls not carried by the configuration after configure"""
+        # Brightness and contrast came with the configuration
+        if self._control_settings().get("rotation", 0) > 0:
+            self._apply_controls()
+    
+    def _control_settings(self):
+        """Config merged with the runtime control values, as a new dict"""
+        settings = dict(self.config)
+        settings.update(self._control_overrides)
+        return settings
+    
+    def _control_values(self):
+        """
+        Brightness and contrast controls for the current settings
+        
+        Returns:
+            dict of picamera2 control values
+        """
+        settings = self._control_settings()
+        
+        # Convert brightness 0-100 to -1.0 to 1.0 and contrast
+        # -100 to 100 to 0.0 to 2.0
+        return {
+            "Brightness": (settings.get("brightness", 50) - 50) / 50.0,
+            "Contrast": (settings.get("contrast", 0) + 100) / 100.0
+        }
+    
+    def set_brightness(self, value):
+        """Set camera brightness"""
+        return self._apply_controls(brightness=value)
+    
     def set_contrast(self, value):
         """Set camera contrast"""
-        if not self.camera:
-            return False
-        
-        try:
-            # Convert -100 to 100 to 0.0 to 2.0
-            normalized = (value + 100) / 100.0
-            
-            # Set contrast
-            self.camera.set_controls({"Contrast": normalized})
-            return True
-        except Exception as e:
-            print(f"Error setting contrast: {e}")
-            return False
+        return self._apply_controls(contrast=value)
     
     def release(self):
         """Release camera resources"""
         if self.recording:
             self.stop_recording()
+        self._wait_for_flush()
         
         if self.stream_active:
             self.stop_stream()
         
+        # Finish pending image saves
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+        
         # Release video writer if it exists
         if self.video_writer is not None:
             try:
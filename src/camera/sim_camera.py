@@ -1,8 +1,22 @@
 import numpy as np
 import time
+import functools
 from datetime import datetime
 import cv2
 
+try:
+    # Optional PyAV, used for the Pi's hardware H.264 encoder
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# Background gray level over one period of the pulse, stepped in four
+# levels (10, 20, 30, 40) so repeated frames hit the render cache
+_PULSE_STEPS = 64
+_PULSE_GRAY = tuple(10 + int(round((np.sin(2 * np.pi * i / _PULSE_STEPS) + 1) * 1.5)) * 10
+                    for i in range(_PULSE_STEPS))
+
 class SimCamera:
     """A simulated camera for testing without actual hardware."""
     
@@ -12,6 +26,10 @@ class SimCamera:
         self.height = self.config.get("resolution", [640, 480])[1]
         self.is_streaming = False
         self.is_recording = False
+        self.video_writer = None
+        self.av_container = None
+        self.av_stream = None
+        self._bgr_buf = None  # Reused RGB->BGR conversion target
         self.frame = self._create_dummy_frame("Camera is OFF")
 
     def start_stream(self):
@@ -34,7 +52,8 @@ class SimCamera:
         return self._create_dummy_frame(f"{datetime.now():%H:%M:%S}")
 
     def capture_image(self):
-        return self._create_dummy_frame("Captured Image")
+        # Captured images are kept and passed on, so give out a private copy
+        return self._create_dummy_frame("Captured Image").copy()
 
     def save_image(self, image, file_path):
         """Save image to file"""
@@ -56,33 +75,80 @@ class SimCamera:
     def start_recording(self, path):
         self.is_recording = True
         self.recording_path = path
-        # Create a video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        self.video_writer = cv2.VideoWriter(
-            path, fourcc, 30, (self.width, self.height)
-        )
+        
+        # Prefer the V4L2 hardware H.264 encoder, available on the Pi
+        if AV_AVAILABLE:
+            self._start_av_recording(path)
+        
+        if self.av_container is None:
+            # Create a video writer (software encoding)
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            self.video_writer = cv2.VideoWriter(
+                path, fourcc, 30, (self.width, self.height)
+            )
         return True
 
-    def write_video_frame(self, frame):
-        if self.is_recording and hasattr(self, 'video_writer') and self.video_writer is not None:
+    def _start_av_recording(self, path):
+        """Open a PyAV container encoding with h264_v4l2m2m, if the codec exists"""
+        try:
+            container = av.open(path, 'w')
+        except Exception as e:
+            print(f"Could not open {path} with PyAV: {e}")
+            return
+        
+        try:
+            stream = container.add_stream('h264_v4l2m2m', rate=30)
+            stream.width = self.width
+            stream.height = self.height
+            stream.pix_fmt = 'yuv420p'
+        except Exception as e:
+            print(f"Hardware H.264 encoder not available, using OpenCV: {e}")
+            container.close()
+            return
+        
+        self.av_container = container
+        self.av_stream = stream
+
+    def _encode_frame(self, frame):
+        """Encode one RGB frame with whichever recorder is active"""
+        if self.av_container is not None:
+            # PyAV takes RGB directly and converts to YUV itself
+            av_frame = av.VideoFrame.from_ndarray(frame, format='rgb24')
+            for packet in self.av_stream.encode(av_frame):
+                self.av_container.mux(packet)
+        elif self.video_writer is not None:
             if len(frame.shape) == 3 and frame.shape[2] == 3:
-                bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                if self._bgr_buf is None or self._bgr_buf.shape != frame.shape:
+                    self._bgr_buf = np.empty_like(frame)
+                # The writer copies the frame, so the buffer can be reused
+                bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=self._bgr_buf)
             else:
                 bgr_frame = frame
             self.video_writer.write(bgr_frame)
 
+    def write_video_frame(self, frame):
+        if self.is_recording:
+            self._encode_frame(frame)
+
     def stop_recording(self):
         self.is_recording = False
-        if hasattr(self, 'video_writer') and self.video_writer is not None:
+        if self.video_writer is not None or self.av_container is not None:
             try:
                 # Write some frames to ensure a valid video file
                 for _ in range(30):  # Add 1 second of footage
                     frame = self._create_dummy_frame(f"Recording {datetime.now():%H:%M:%S}")
-                    bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    self.video_writer.write(bgr_frame)
+                    self._encode_frame(frame)
                 
-                self.video_writer.release()
-                self.video_writer = None
+                if self.av_container is not None:
+                    # Flush frames buffered in the encoder
+                    for packet in self.av_stream.encode():
+                        self.av_container.mux(packet)
+                    self.av_container.close()
+                    self.av_container = None
+                    self.av_stream = None
+                else:
+                    self.video_writer.release()
+                    self.video_writer = None
                 return True
             except Exception as e:
                 print(f"Error in stop_recording: {e}")
@@ -110,24 +176,32 @@ class SimCamera:
         self.stop_recording()
 
     def _create_dummy_frame(self, text):
-        """Creates a black frame with text."""
-        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        """
+        Creates a dark frame with text.
         
-        # Simple pulsating background to simulate activity
-        gray_value = int(10 + (np.sin(time.time()) + 1) * 15)
-        frame[:] = (gray_value, gray_value, gray_value)
-
-        # Add text
-        font = 0 # cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 1.2
-        thickness = 2
-        text_size = (len(text) * 20, 20) # A rough estimation of text size
-        text_x = (self.width - text_size[0]) // 2
-        text_y = (self.height + text_size[1]) // 2
-        
-        # A simple white text display
-        # In a real OpenCV environment, you'd use cv2.putText
-        # This is a simplified placeholder
-        # For this to work without cv2, we will just return the frame
-        cv2.putText(frame, text, (text_x, text_y), font, font_scale, (255, 255, 255), thickness)
-        return frame 
\ No newline at end of file
+        Frames are cached and shared, so the result is read-only.
+        """
+        # Simple pulsating background to simulate activity (period 2*pi s)
+        step = int(time.time() * _PULSE_STEPS / (2 * np.pi)) % _PULSE_STEPS
+        gray_value = _PULSE_GRAY[step]
+        return _render_dummy_frame(text, self.width, self.height, gray_value)
+
+
+@functools.lru_cache(maxsize=8)
+def _render_dummy_frame(text, width, height, gray_value):
+    """Render a read-only frame filled with gray_value and centered text."""
+    frame = np.full((height, width, 3), gray_value, dtype=np.uint8)
+
+    # Add text
+    font = 0 # cv2.FONT_HERSHEY_SIMPLEX
+    font_scale = 1.2
+    thickness = 2
+    text_size = (len(text) * 20, 20) # A rough estimation of text size
+    text_x = (width - text_size[0]) // 2
+    text_y = (height + text_size[1]) // 2
+    
+    # A simple white text display
+    cv2.putText(frame, text, (text_x, text_y), font, font_scale, (255, 255, 255), thickness)
+    
+    frame.setflags(write=False)
+    return frame
\ No newline at end of file
@@ -6,13 +6,16 @@ Initializes the GUI and connects to the camera module
 
 import sys
 import os
+import logging
 import platform
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox
-from PyQt5.QtGui import QIcon
+import threading
 
-# Import our modules
-from ui.main_window import MainWindow
-from utils.config import load_config
+USAGE = """Usage: main.py [options]
+
+Options:
+  -s, --sim   Use a simulated camera instead of camera hardware
+  --debug     Log debug messages
+  -h, --help  Show this message and exit"""
 
 
 def setup_environment():
@@ -27,8 +30,7 @@ def setup_environment():
     videos_dir = os.path.join(output_dir, 'videos')
     
     for directory in [output_dir, images_dir, videos_dir]:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        os.makedirs(directory, exist_ok=True)
     
     # Detect system for camera functionality
     system = platform.system()
@@ -45,6 +47,20 @@ def setup_environment():
 
 def main():
     """Main function to run the application"""
+    if '--help' in sys.argv or '-h' in sys.argv:
+        print(USAGE)
+        return
+    
+    # Configure logging once, for every module
+    logging.basicConfig(level=logging.DEBUG if '--debug' in sys.argv else logging.INFO)
+    
+    # Qt and the UI (which pulls in OpenCV and the camera modules) are
+    # imported only once the application is actually going to start
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from ui.main_window import MainWindow
+    from utils.config import load_config
+    from analysis.brightness_analyzer import warm_up_kernels
+    
     # Set base directory for the application
     if getattr(sys, 'frozen', False):
         # The application is frozen
@@ -67,6 +83,10 @@ def main():
     
     main_win = MainWindow(config)
     main_win.show()
+    
+    # Compile (or load the cached) analysis kernels while the user picks
+    # media, instead of on the first analysis
+    threading.Thread(target=warm_up_kernels, daemon=True).start()
 
     if os.environ.get('SIMULATION_MODE') == 'True':
         QMessageBox.information(main_win, "Simulation Mode", "Running in simulation mode.")
@@ -4,27 +4,401 @@ Analysis tab for the Brightness Detector application
 
 import os
 import time
-import threading
+import glob
+import hashlib
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QComboBox, QProgressBar, QGroupBox, 
     QCheckBox, QSpinBox, QMessageBox, QFileDialog,
     QFrame, QGridLayout
 )
-from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
-from PyQt5.QtGui import QImage, QPixmap, QPainter, QPen, QColor
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QObject, QThread, QRunnable, QThreadPool, QTimer
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor
 import numpy as np
 import cv2
 from PIL import Image, ImageSequence
 import logging
 
+try:
+    # Optional imageio, decodes GIF frames without PIL's per-frame conversion
+    import imageio.v3 as iio
+    IMAGEIO_AVAILABLE = True
+except ImportError:
+    IMAGEIO_AVAILABLE = False
+
 # Import our modules
 from analysis.brightness_analyzer import BrightnessAnalyzer
+from ui.image_utils import frame_to_pixmap
+from utils.config import get_cache_dir
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+# Set up logging (configured by main)
 logger = logging.getLogger(__name__)
 
+def open_video(file_path):
+    """
+    Open a video file, retrying special formats with a matching backend
+    
+    Args:
+        file_path: Path of the video file
+        
+    Returns:
+        cv2.VideoCapture; the caller releases it
+    """
+    capture = cv2.VideoCapture(file_path)
+    
+    # Check if the video was opened successfully
+    if not capture.isOpened():
+        file_ext = os.path.splitext(file_path)[1].lower()
+        # Raw H.264 and MJPEG streams have no container, so retry with the
+        # FFMPEG backend, which probes the stream format by itself. (Setting
+        # CAP_PROP_FOURCC on an opened file has no effect, and
+        # CAP_PROP_BUFFERSIZE only applies to live V4L2 devices.)
+        if file_ext in ('.h264', '.mjpeg', '.mjpg'):
+            capture = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
+    
+    return capture
+
+class GifLoader(QObject):
+    """Decodes the frames of a GIF on a worker thread"""
+    
+    # Define signals
+    frame_ready = pyqtSignal(int, object)  # Frame index and RGB frame
+    finished = pyqtSignal(object)  # All decoded frames as one array
+    failed = pyqtSignal(str)  # Error message
+    
+    def __init__(self, file_path, cache_dir=None, max_cached=8):
+        """
+        Args:
+            file_path: Path of the GIF
+            cache_dir: Directory for decoded frame caches, None to disable
+            max_cached: Number of decoded GIFs kept in cache_dir
+        """
+        super().__init__()
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self._cancelled = False
+    
+    def cancel(self):
+        """Stop decoding after the current frame"""
+        self._cancelled = True
+    
+    @pyqtSlot()
+    def run(self):
+        """
+        Decode the GIF, emitting each frame as soon as it is decoded
+        
+        All frames are decoded into a single preallocated (N, H, W, 3)
+        array, so a GIF costs one allocation instead of one per frame and
+        the emitted frames are views into it.
+        
+        The decoded array is saved as a .npy file keyed by the GIF's path,
+        modification time and size. Loading the same GIF again memory-maps
+        that file instead of decoding the frames. With the cache enabled
+        the frames are decoded straight into that file (see
+        _allocate_frames).
+        """
+        cache_path = self._cache_path()
+        frames = self._load_cached(cache_path)
+        if frames is not None:
+            logger.debug(f"Loaded {len(frames)} GIF frames from cache {cache_path}")
+            self.frame_ready.emit(0, frames[0])
+            self.finished.emit(frames)
+            return
+        
+        temp_path = None
+        try:
+            with Image.open(self.file_path) as gif:
+                n_frames = getattr(gif, 'n_frames', 1)
+                width, height = gif.size
+            frames, temp_path = self._allocate_frames((n_frames, height, width, 3), cache_path)
+            
+            count = 0
+            for index, frame in enumerate(self._iter_frames()):
+                if self._cancelled:
+                    break
+                if index >= n_frames or frame.shape != frames.shape[1:]:
+                    raise ValueError("GIF frames do not match the size in its header")
+                frames[index] = frame
+                count += 1
+                self.frame_ready.emit(index, frames[index])
+        except Exception as e:
+            logger.error(f"Error loading GIF: {str(e)}", exc_info=True)
+            self._discard(temp_path)
+            self.failed.emit(str(e))
+            return
+        
+        self.finished.emit(frames[:count])
+        
+        if cache_path is not None and count == n_frames:
+            self._save_cached(cache_path, frames, temp_path)
+        else:
+            self._discard(temp_path)
+    
+    def _allocate_frames(self, shape, cache_path):
+        """
+        Allocate the frame buffer, backed by a cache file when possible
+        
+        Frames decoded into a memory-mapped file do not pin anonymous
+        memory: once written back, the kernel can drop their pages and
+        read them in again on access, so a long GIF does not have to fit
+        in RAM. The file becomes the cache once every frame is decoded.
+        Windows cannot rename a mapped file, so there the frames are
+        decoded in memory and saved afterwards.
+        
+        Args:
+            shape: (N, H, W, 3) shape of the decoded GIF
+            cache_path: Path from _cache_path
+            
+        Returns:
+            (frames, temp_path); temp_path is the backing file, or None for
+            an in-memory buffer
+        """
+        if cache_path is not None and os.name != 'nt':
+            temp_path = cache_path + ".tmp.npy"
+            try:
+                frames = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.uint8, shape=shape)
+                return frames, temp_path
+            except OSError as e:
+                logger.debug(f"Decoding GIF frames in memory: {str(e)}")
+        return np.empty(shape, dtype=np.uint8), None
+    
+    def _discard(self, temp_path):
+        """Remove the backing file of an incomplete decode"""
+        if temp_path is not None and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    
+    def _cache_path(self):
+        """Path of the frame cache for the GIF, or None without a cache"""
+        if self.cache_dir is None:
+            return None
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(self.file_path)}:{stat.st_mtime}:{stat.st_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+    
+    def _load_cached(self, cache_path):
+        """
+        Memory-map cached frames
+        
+        Args:
+            cache_path: Path from _cache_path
+            
+        Returns:
+            Read-only (N, H, W, 3) array, or None if there is no usable cache
+        """
+        if cache_path is None or not os.path.exists(cache_path):
+            return None
+        try:
+            frames = np.load(cache_path, mmap_mode='r')
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable GIF cache {cache_path}: {str(e)}")
+            return None
+        if frames.ndim != 4 or frames.shape[-1] != 3 or len(frames) == 0:
+            return None
+        
+        # Mark the cache as recently used, so it is pruned last. This is
+        # best-effort: the directory may be read-only or the file evicted
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return frames
+    
+    def _save_cached(self, cache_path, frames, temp_path=None):
+        """
+        Save decoded frames to the cache, dropping the oldest caches
+        
+        Args:
+            cache_path: Path from _cache_path
+            frames: Decoded (N, H, W, 3) frames
+            temp_path: File backing frames, from _allocate_frames, if any
+        """
+        # Write to a temporary file first so a partly written cache is
+        # never loaded
+        try:
+            if temp_path is None:
+                temp_path = cache_path + ".tmp.npy"
+                np.save(temp_path, frames)
+            else:
+                frames.flush()
+            os.replace(temp_path, cache_path)
+            
+            # Drop the oldest caches and files left by interrupted decodes
+            cached = glob.glob(os.path.join(self.cache_dir, "*.npy"))
+            stale = [path for path in cached if path.endswith(".tmp.npy")]
+            cached = sorted(set(cached) - set(stale), key=os.path.getmtime)
+            for path in stale + cached[:-self.max_cached]:
+                os.remove(path)
+        except OSError as e:
+            logger.debug(f"Could not cache GIF frames: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _iter_frames(self):
+        """
+        Yield the frames of the GIF as (H, W, 3) uint8 RGB arrays
+        
+        imageio is used when available; PIL is the fallback, also when
+        imageio cannot decode the file.
+        """
+        if IMAGEIO_AVAILABLE:
+            count = 0
+            try:
+                for frame in iio.imiter(self.file_path, plugin="pillow", mode="RGB"):
+                    count += 1
+                    yield frame
+                return
+            except Exception as e:
+                if count:
+                    raise
+                logger.debug(f"imageio could not decode GIF, using PIL: {str(e)}")
+        
+        with Image.open(self.file_path) as gif:
+            logger.debug(f"GIF loaded successfully. Size: {gif.size}, Mode: {gif.mode}")
+            logger.debug(f"Number of frames: {getattr(gif, 'n_frames', 'unknown')}")
+            
+            # No per-frame logging: formatting a message per frame costs
+            # more than converting a small frame
+            for frame in ImageSequence.Iterator(gif):
+                # Convert PIL image to RGB mode; run copies it into the
+                # frame buffer before the next frame is decoded
+                yield np.asarray(frame.convert('RGB'))
+
+
+class MediaLoader(QObject):
+    """Decodes the first frame of a video, or an image, on a worker thread"""
+    
+    # Define signals
+    loaded = pyqtSignal(object, object)  # RGB frame and video properties (None for an image)
+    failed = pyqtSignal(str)  # Error message
+    
+    def __init__(self, file_path, is_video):
+        super().__init__()
+        self.file_path = file_path
+        self.is_video = is_video
+    
+    @pyqtSlot()
+    def run(self):
+        """Decode the media and emit its first frame converted to RGB"""
+        try:
+            if self.is_video:
+                # Read first frame and properties for preview; the file is
+                # opened again when it is analyzed
+                video = open_video(self.file_path)
+                try:
+                    ret, frame = video.read()
+                    properties = {
+                        'fps': video.get(cv2.CAP_PROP_FPS),
+                        'frame_count': int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+                    }
+                finally:
+                    video.release()
+                if not ret:
+                    self.failed.emit("Could not read video file")
+                    return
+            else:
+                frame = cv2.imread(self.file_path)
+                properties = None
+                if frame is None:
+                    self.failed.emit("Could not read image file")
+                    return
+            
+            # Convert BGR to RGB in place for display and analysis
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        except Exception as e:
+            logger.error(f"Error loading media: {str(e)}", exc_info=True)
+            self.failed.emit(str(e))
+            return
+        
+        self.loaded.emit(frame, properties)
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside an analysis to abort it"""
+
+
+class AnalysisSignals(QObject):
+    """Signals of an AnalysisWorker, which as a QRunnable cannot own any"""
+    
+    # Define signals
+    progress_update = pyqtSignal(int)  # Progress in percent
+    finished = pyqtSignal(object)  # Analysis result dictionary
+    failed = pyqtSignal(str)  # Error message
+
+
+class AnalysisWorker(QRunnable):
+    """Runs one brightness analysis on the global thread pool"""
+    
+    def __init__(self, analyzer, analysis_type, media, sample_rate, media_path=None):
+        """
+        Args:
+            analyzer: BrightnessAnalyzer to run
+            analysis_type: "frame", "video" or "gif"
+            media: Image, video file path or GIF frames to analyze
+            sample_rate: Analyze every Nth frame of a video or GIF
+            media_path: Path the media was loaded from
+        """
+        super().__init__()
+        # The tab keeps a reference while the worker runs
+        self.setAutoDelete(False)
+        self.signals = AnalysisSignals()
+        self.analyzer = analyzer
+        self.analysis_type = analysis_type
+        self.media = media
+        self.sample_rate = sample_rate
+        self.media_path = media_path
+        self._cancelled = False
+    
+    def cancel(self):
+        """Abort the analysis at its next progress update"""
+        self._cancelled = True
+    
+    def _report_progress(self, value):
+        if self._cancelled:
+            raise AnalysisCancelled()
+        self.signals.progress_update.emit(value)
+    
+    def run(self):
+        """Run the analysis, reporting progress and the result as signals"""
+        # The analyzer reports each change of its progress percentage
+        self.analyzer.progress_callback = self._report_progress
+        try:
+            self.analyzer.progress = 0
+            if self.analysis_type == "video":
+                # The capture is only held open for the analysis itself
+                video = open_video(self.media)
+                try:
+                    result = self.analyzer.analyze_video(
+                        video,
+                        sample_rate=self.sample_rate,
+                        file_path=self.media
+                    )
+                finally:
+                    video.release()
+            elif self.analysis_type == "gif":
+                result = self.analyzer.analyze_gif(self.media, sample_rate=self.sample_rate)
+            else:
+                result = self.analyzer.analyze_image(self.media)
+            self.analyzer.progress = 100
+        except AnalysisCancelled:
+            logger.info("Analysis cancelled.")
+            return
+        except Exception as e:
+            logger.error(f"Analysis error: {str(e)}", exc_info=True)
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            self.analyzer.progress_callback = None
+        
+        self.signals.finished.emit(result)
+
+
 class AnalysisTab(QWidget):
     """Analysis tab UI"""
     
@@ -36,13 +410,22 @@ class AnalysisTab(QWidget):
         self.config = config
         self.media_path = None
         self.current_image = None
-        self.current_video = None
+        self.video_path = None
         self.is_gif = False
         self.gif_frames = []
+        self.gif_loader = None
+        self.gif_thread = None
+        self.media_loader = None
+        self.media_thread = None
         self.video_player = None
+        self.analysis_worker = None
         self.analyzer = BrightnessAnalyzer(config["analysis"])
-        self.analysis_thread = None
         self.analysis_results = None
+        self._preview_source = None  # Last painted frame, repainted on resize
+        self._pending_preview = None  # Frame waiting to be painted
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.timeout.connect(self._flush_preview)
         self.init_ui()
     
     def init_ui(self):
@@ -186,10 +569,12 @@ class AnalysisTab(QWidget):
             is_video = file_ext in ('.mp4', '.avi', '.mov', '.h264', '.mjpeg', '.mjpg')
             self.is_gif = file_ext == '.gif'
             
-            logger.debug(f"Loading media file: {file_path}")
-            logger.debug(f"File extension: {file_ext}")
-            logger.debug(f"Is GIF: {self.is_gif}")
-            logger.debug(f"File size: {os.path.getsize(file_path)} bytes")
+            # Only build the messages (and stat the file) when they are shown
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Loading media file: {file_path}")
+                logger.debug(f"File extension: {file_ext}")
+                logger.debug(f"Is GIF: {self.is_gif}")
+                logger.debug(f"File size: {os.path.getsize(file_path)} bytes")
             
             if self.is_gif:
                 # Load GIF using PIL
@@ -204,46 +589,10 @@ class AnalysisTab(QWidget):
                             raise ValueError("File is not a valid GIF image")
                         logger.debug(f"GIF format verified. Image mode: {test_img.mode}")
                     
-                    # Now load the GIF for processing
-                    gif = Image.open(file_path)
-                    logger.debug(f"GIF loaded successfully. Size: {gif.size}, Mode: {gif.mode}")
-                    logger.debug(f"Number of frames: {getattr(gif, 'n_frames', 'unknown')}")
-                    
-                    # Extract frames
-                    frame_count = 0
-                    for frame in ImageSequence.Iterator(gif):
-                        logger.debug(f"Processing frame {frame_count + 1}")
-                        # Convert PIL image to RGB mode
-                        rgb_frame = frame.convert('RGB')
-                        # Convert to numpy array
-                        np_frame = np.array(rgb_frame)
-                        logger.debug(f"Frame shape: {np_frame.shape}")
-                        # Append to frames list
-                        self.gif_frames.append(np_frame)
-                        frame_count += 1
-                    
-                    # Set the first frame as current image
-                    if self.gif_frames:
-                        logger.debug(f"Successfully extracted {len(self.gif_frames)} frames from GIF")
-                        self.current_image = self.gif_frames[0]
-                        self.update_preview(self.current_image)
-                        
-                        print(f"Loaded GIF: {file_path}")
-                        print(f"Frames: {len(self.gif_frames)}")
-                        
-                        # Set analyze option to video since GIF has multiple frames
-                        self.analyze_option.setCurrentIndex(1)
-                        # Enable analysis button
-                        self.analyze_button.setEnabled(True)
-                        
-                        # Show success message
-                        QMessageBox.information(
-                            self,
-                            "GIF Loaded",
-                            f"Successfully loaded GIF with {len(self.gif_frames)} frames"
-                        )
-                    else:
-                        raise ValueError("No frames were extracted from the GIF")
+                    # Decode the frames on a worker thread so the UI stays
+                    # responsive; the first frame is previewed as soon as
+                    # it is decoded
+                    self._start_gif_loader(file_path)
                     
                 except Exception as e:
                     logger.error(f"Error loading GIF: {str(e)}", exc_info=True)
@@ -251,71 +600,11 @@ class AnalysisTab(QWidget):
                     self.clear()
                     return
             
-            elif is_video:
-                # Load video
-                self.media_path = file_path
-                self.current_video = cv2.VideoCapture(file_path)
-                
-                # Check if the video was opened successfully
-                if not self.current_video.isOpened():
-                    # Try with additional OpenCV options for special formats
-                    if file_ext == '.h264':
-                        # Try with FFMPEG backend specifically for h264
-                        self.current_video = cv2.VideoCapture(file_path, cv2.CAP_FFMPEG)
-                    elif file_ext in ('.mjpeg', '.mjpg'):
-                        # Try with specific MJPEG settings
-                        self.current_video = cv2.VideoCapture(file_path)
-                        # Set MJPEG codec explicitly
-                        self.current_video.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'))
-                
-                # Read first frame for preview
-                ret, frame = self.current_video.read()
-                if ret:
-                    # Convert BGR to RGB for display
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    self.current_image = frame
-                    self.update_preview(frame)
-                    
-                    # Get video properties
-                    fps = self.current_video.get(cv2.CAP_PROP_FPS)
-                    frame_count = int(self.current_video.get(cv2.CAP_PROP_FRAME_COUNT))
-                    duration = frame_count / fps if fps > 0 else 0
-                    
-                    print(f"Loaded video: {file_path}")
-                    print(f"Format: {file_ext}, Frames: {frame_count}, FPS: {fps}, Duration: {duration:.2f}s")
-                    
-                    # Set analyze option to video
-                    self.analyze_option.setCurrentIndex(1)
-                    # Enable analysis button
-                    self.analyze_button.setEnabled(True)
-                else:
-                    QMessageBox.warning(self, "Video Error", "Could not read video file")
-                    self.clear()
-                    return
-            
             else:
-                # Load image
+                # Decode the video's first frame or the image on a worker
+                # thread; analysis is enabled once it is previewed
                 self.media_path = file_path
-                self.current_image = cv2.imread(file_path)
-                if self.current_image is not None:
-                    # Convert BGR to RGB for display
-                    self.current_image = cv2.cvtColor(self.current_image, cv2.COLOR_BGR2RGB)
-                    self.update_preview(self.current_image)
-                    
-                    print(f"Loaded image: {file_path}")
-                    print(f"Size: {self.current_image.shape[1]}x{self.current_image.shape[0]}")
-                    
-                    # Set analyze option to frame
-                    self.analyze_option.setCurrentIndex(0)
-                    # Enable analysis button
-                    self.analyze_button.setEnabled(True)
-                else:
-                    QMessageBox.warning(self, "Image Error", "Could not read image file")
-                    self.clear()
-                    return
-            
-            # Enable analysis button
-            self.analyze_button.setEnabled(True)
+                self._start_media_loader(file_path, is_video)
             
             # Show media info in status bar (if available)
             if hasattr(self, 'parent') and hasattr(self.parent(), 'statusBar'):
@@ -327,29 +616,200 @@ class AnalysisTab(QWidget):
             QMessageBox.warning(self, "Error", f"Error loading media: {str(e)}")
             self.clear()
     
-    def set_image(self, image):
-        """Set current image from numpy array"""
+    def _start_media_loader(self, file_path, is_video):
+        """Start decoding a video's first frame or an image on a worker thread"""
+        self.media_loader = MediaLoader(file_path, is_video)
+        self.media_thread = QThread()
+        self.media_loader.moveToThread(self.media_thread)
+        
+        self.media_thread.started.connect(self.media_loader.run)
+        self.media_loader.loaded.connect(self._on_media_loaded)
+        self.media_loader.failed.connect(self._on_media_failed)
+        self.media_loader.loaded.connect(self.media_thread.quit)
+        self.media_loader.failed.connect(self.media_thread.quit)
+        self.media_thread.start()
+    
+    def _stop_media_loader(self):
+        """Wait for any media still being decoded"""
+        if self.media_thread is not None:
+            self.media_thread.quit()
+            self.media_thread.wait()
+        self.media_loader = None
+        self.media_thread = None
+    
+    @pyqtSlot(object, object)
+    def _on_media_loaded(self, frame, properties):
+        """Preview a decoded image or first video frame"""
+        # Ignore media from a load that has since been cleared
+        if self.sender() is not self.media_loader:
+            return
+        
+        self.current_image = frame
+        self.update_preview(frame)
+        
+        file_ext = os.path.splitext(self.media_path)[1].lower()
+        if self.media_loader.is_video:
+            self.video_path = self.media_path
+            
+            # Get video properties
+            fps = properties['fps']
+            frame_count = properties['frame_count']
+            duration = frame_count / fps if fps > 0 else 0
+            
+            print(f"Loaded video: {self.media_path}")
+            print(f"Format: {file_ext}, Frames: {frame_count}, FPS: {fps}, Duration: {duration:.2f}s")
+            
+            # Set analyze option to video
+            self.analyze_option.setCurrentIndex(1)
+        else:
+            print(f"Loaded image: {self.media_path}")
+            print(f"Size: {frame.shape[1]}x{frame.shape[0]}")
+            
+            # Set analyze option to frame
+            self.analyze_option.setCurrentIndex(0)
+        
+        # Enable analysis button
+        self.analyze_button.setEnabled(True)
+    
+    @pyqtSlot(str)
+    def _on_media_failed(self, message):
+        """Called when a video or image could not be decoded"""
+        if self.sender() is not self.media_loader:
+            return
+        
+        title = "Video Error" if self.media_loader.is_video else "Image Error"
+        QMessageBox.warning(self, title, message)
+        self.clear()
+    
+    def _start_gif_loader(self, file_path):
+        """Start decoding a GIF on a worker thread"""
+        cache_dir = None
+        if self.config["analysis"].get("cache_gif_frames", True):
+            cache_dir = get_cache_dir()
+        self.gif_loader = GifLoader(
+            file_path,
+            cache_dir,
+            self.config["analysis"].get("gif_cache_max_files", 8)
+        )
+        self.gif_thread = QThread()
+        self.gif_loader.moveToThread(self.gif_thread)
+        
+        self.gif_thread.started.connect(self.gif_loader.run)
+        self.gif_loader.frame_ready.connect(self._on_gif_frame)
+        self.gif_loader.finished.connect(self._on_gif_loaded)
+        self.gif_loader.failed.connect(self._on_gif_failed)
+        self.gif_loader.finished.connect(self.gif_thread.quit)
+        self.gif_loader.failed.connect(self.gif_thread.quit)
+        self.gif_thread.start()
+    
+    def _stop_gif_loader(self):
+        """Cancel any GIF still being decoded and wait for its thread"""
+        if self.gif_thread is not None:
+            self.gif_loader.cancel()
+            self.gif_thread.quit()
+            self.gif_thread.wait()
+        self.gif_loader = None
+        self.gif_thread = None
+    
+    @pyqtSlot(int, object)
+    def _on_gif_frame(self, index, frame):
+        """Collect a decoded GIF frame and preview the first one"""
+        # Ignore frames from a loader that has since been cancelled
+        if self.sender() is not self.gif_loader:
+            return
+        
+        self.gif_frames.append(frame)
+        if index == 0:
+            self.current_image = frame
+            self.update_preview(frame)
+    
+    @pyqtSlot(object)
+    def _on_gif_loaded(self, frames):
+        """Called when all GIF frames are decoded"""
+        if self.sender() is not self.gif_loader:
+            return
+        
+        if len(frames) == 0:
+            self._on_gif_failed("No frames were extracted from the GIF")
+            return
+        
+        self.gif_frames = frames
+        logger.debug(f"Successfully extracted {len(self.gif_frames)} frames from GIF")
+        print(f"Loaded GIF: {self.media_path}")
+        print(f"Frames: {len(self.gif_frames)}")
+        
+        # Set analyze option to video since GIF has multiple frames
+        self.analyze_option.setCurrentIndex(1)
+        # Enable analysis button
+        self.analyze_button.setEnabled(True)
+        
+        # Show success message
+        QMessageBox.information(
+            self,
+            "GIF Loaded",
+            f"Successfully loaded GIF with {len(self.gif_frames)} frames"
+        )
+    
+    @pyqtSlot(str)
+    def _on_gif_failed(self, message):
+        """Called when a GIF could not be decoded"""
+        if self.sender() is not self.gif_loader:
+            return
+        
+        QMessageBox.warning(self, "GIF Error", f"Error loading GIF: {message}")
+        self.clear()
+    
+    def set_image(self, image, take_ownership=False):
+        """
+        Set current image from numpy array
+        
+        Args:
+            image: RGB image
+            take_ownership: Use image without copying it; only for callers
+                that will not modify image afterwards
+        """
         if image is not None:
             self.clear()
-            self.current_image = image.copy()
+            self.current_image = image if take_ownership else image.copy()
             self.update_preview(image)
             self.analyze_button.setEnabled(True)
             # Set analyze option to frame
             self.analyze_option.setCurrentIndex(0)
     
     def update_preview(self, frame):
-        """Update the media preview with the given frame"""
-        height, width, channel = frame.shape
-        bytes_per_line = channel * width
-        q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
+        """
+        Update the media preview with the given RGB frame
         
-        # Display the QImage in the QLabel
-        self.media_preview.setPixmap(QPixmap.fromImage(q_image).scaled(
+        The frame is painted shortly after, by _flush_preview; when several
+        updates arrive in quick succession only the last one is painted.
+        """
+        self._pending_preview = frame
+        if not self._preview_timer.isActive():
+            self._preview_timer.start(16)
+    
+    @pyqtSlot()
+    def _flush_preview(self):
+        """Paint the latest frame passed to update_preview"""
+        if self._pending_preview is None:
+            return
+        frame = self._pending_preview
+        self._pending_preview = None
+        
+        self._preview_source = frame
+        self.media_preview.setPixmap(frame_to_pixmap(
+            frame,
             self.media_preview.width(),
-            self.media_preview.height(),
-            Qt.KeepAspectRatio
+            self.media_preview.height()
         ))
     
+    def resizeEvent(self, event):
+        # Rebuild the preview from its frame at the new size; scaling the
+        # old pixmap up would blur it. update_preview coalesces the
+        # repaints while the window is being dragged
+        if self._preview_source is not None and self._pending_preview is None:
+            self.update_preview(self._preview_source)
+        super().resizeEvent(event)
+    
     def draw_brightest_point(self, img, point, avg_brightness):
         """Draw markers for the brightest point on the image"""
         # Make a copy to avoid modifying the original
@@ -386,7 +846,7 @@ class AnalysisTab(QWidget):
         """Run brightness analysis on the current media"""
         # Fix for the numpy array boolean check issue
         has_image = self.current_image is not None and isinstance(self.current_image, np.ndarray)
-        has_video = self.current_video is not None
+        has_video = self.video_path is not None
         has_gif = self.is_gif and len(self.gif_frames) > 0
         
         if not (has_image or has_video or has_gif):
@@ -406,95 +866,66 @@ class AnalysisTab(QWidget):
         analysis_type = "video" if self.analyze_option.currentIndex() == 1 else "frame"
         
         # Show progress bar
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0) # Indeterminate progress
+        self.progress_bar.setRange(0, 100)
+        self._set_analysis_running(True)
         
-        # Disable buttons during analysis
-        self.load_button.setEnabled(False)
-        self.analyze_button.setEnabled(False)
-        self.clear_button.setEnabled(False)
+        # Pick the media for the selected analysis
+        if analysis_type == "video" and has_video:
+            media = self.video_path
+        elif analysis_type == "video" and has_gif:
+            analysis_type = "gif"
+            media = self.gif_frames
+        else:
+            analysis_type = "frame"
+            media = self.current_image
         
-        # Start analysis in a thread
-        self.analysis_thread = threading.Thread(
-            target=self._run_analysis_thread,
-            args=(analysis_type,),
-            daemon=True
+        # Start analysis on the thread pool. The worker reports back through
+        # signals, which Qt delivers on the UI thread
+        self.analysis_worker = AnalysisWorker(
+            self.analyzer,
+            analysis_type,
+            media,
+            self.config["analysis"]["sample_rate"],
+            self.media_path
         )
-        self.analysis_thread.start()
+        self.analysis_worker.signals.progress_update.connect(self.progress_bar.setValue)
+        self.analysis_worker.signals.finished.connect(self._on_analysis_result)
+        self.analysis_worker.signals.failed.connect(self._on_analysis_failed)
+        QThreadPool.globalInstance().start(self.analysis_worker)
     
-    def _run_analysis_thread(self, analysis_type):
-        """Run analysis in background thread"""
-        try:
-            if analysis_type == "frame":
-                # Analyze single frame
-                if self.current_image is not None:
-                    # Run the analysis
-                    self.analyzer.progress = 0
-                    result = self.analyzer.analyze_image(self.current_image)
-                    self.analyzer.progress = 100
-                    
-                    # Store results
-                    self.analysis_results = result
-            else:
-                # Analyze video
-                if self.current_video is not None:
-                    # Make sure video is at the start
-                    self.current_video.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    
-                    # Run the analysis
-                    self.analyzer.progress = 0
-                    result = self.analyzer.analyze_video(
-                        self.current_video,
-                        sample_rate=self.config["analysis"]["sample_rate"]
-                    )
-                    self.analyzer.progress = 100
-                    
-                    # Store results
-                    self.analysis_results = result
-                
-                # Analyze GIF
-                elif self.is_gif and self.gif_frames:
-                    # Run the analysis
-                    self.analyzer.progress = 0
-                    result = self.analyzer.analyze_gif(
-                        self.gif_frames,
-                        sample_rate=self.config["analysis"]["sample_rate"]
-                    )
-                    self.analyzer.progress = 100
-                    
-                    # Store results
-                    self.analysis_results = result
-                    
-                    # Update preview with the brightest frame
-                    if result and 'brightest_frame' in result:
-                        self.update_preview(result['brightest_frame'])
+    @pyqtSlot(object)
+    def _on_analysis_result(self, result):
+        """Called on the UI thread when the analysis worker is done"""
+        self.analysis_results = result
         
-            self.progress_bar.setRange(0, 100) # Set to determinate
-            self.analysis_results = result
-            
-            logger.info("Analysis finished.")
-            
-            # Re-enable UI elements on the main thread
-            QTimer.singleShot(0, self.on_analysis_finished)
+        # Update preview with the brightest frame of a GIF
+        if self.is_gif and result and result.get('brightest_frame') is not None:
+            self.update_preview(result['brightest_frame'])
         
-        except Exception as e:
-            # Log error and show message box from main thread
-            logger.error(f"Analysis error: {str(e)}", exc_info=True)
-            QTimer.singleShot(0, lambda: QMessageBox.warning(
-                self, 
-                "Analysis Error", 
-                f"Error during analysis: {str(e)}"
-            ))
+        logger.info("Analysis finished.")
+        self.on_analysis_finished()
     
-    def on_analysis_finished(self):
-        """Called when analysis is complete."""
-        self.progress_bar.setVisible(False)
+    @pyqtSlot(str)
+    def _on_analysis_failed(self, message):
+        """Called on the UI thread when the analysis worker raised"""
+        self.analysis_results = None
+        self._set_analysis_running(False)
+        QMessageBox.warning(self, "Analysis Error", f"Error during analysis: {message}")
+    
+    def _set_analysis_running(self, running):
+        """Show the progress bar and lock the buttons while analysis runs"""
+        self.progress_bar.setVisible(running)
         self.progress_bar.setValue(0)
         
-        # Re-enable buttons
-        self.load_button.setEnabled(True)
-        self.analyze_button.setEnabled(True)
-        self.clear_button.setEnabled(True)
+        # Disable buttons during analysis
+        self.load_button.setEnabled(not running)
+        self.analyze_button.setEnabled(not running)
+        self.clear_button.setEnabled(not running)
+    
+    def on_analysis_finished(self):
+        """Called when analysis is complete."""
+        # Hide the progress bar and re-enable buttons
+        self._set_analysis_running(False)
         
         if self.analysis_results:
             self.analysis_complete.emit(self.analysis_results)
@@ -506,16 +937,18 @@ class AnalysisTab(QWidget):
     def clear(self):
         """Clear the analysis tab"""
         # Clear media
+        self._stop_gif_loader()
+        self._stop_media_loader()
         self.media_path = None
         self.current_image = None
         self.is_gif = False
         self.gif_frames = []
-        
-        if self.current_video is not None:
-            self.current_video.release()
-            self.current_video = None
+        self.video_path = None
         
         # Clear UI
+        self._preview_timer.stop()
+        self._pending_preview = None
+        self._preview_source = None
         self.media_preview.setText("No media loaded")
         self.media_preview.setPixmap(QPixmap())
         self.analyze_button.setEnabled(False)
@@ -524,8 +957,10 @@ class AnalysisTab(QWidget):
     
     def closeEvent(self, event):
         """Handle widget close event"""
-        # Clean up video resources
-        if self.current_video is not None:
-            self.current_video.release()
+        # Do not leave a decoding thread or an analysis running
+        self._stop_gif_loader()
+        self._stop_media_loader()
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
             
         event.accept()
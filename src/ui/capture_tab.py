@@ -7,14 +7,16 @@ import time
 import platform
 import threading
 from datetime import datetime
+from concurrent.futures import Future
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QLabel, QComboBox, QSlider, QGroupBox, QGridLayout,
     QCheckBox, QMessageBox, QFileDialog, QFrame
 )
 from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
-from PyQt5.QtGui import QImage, QPixmap
 from utils.config import update_config
+from ui.dark_theme import ACTIVE_BUTTON_STYLE
+from ui.image_utils import frame_to_pixmap
 
 # Determine if running in simulation mode
 IS_SIM_MODE = os.environ.get("SIMULATION_MODE", "False").lower() == "true"
@@ -58,6 +60,7 @@ class CaptureTab(QWidget):
     
     # Define signals
     image_captured = pyqtSignal(object)  # Signal emitted when image is captured
+    image_saved = pyqtSignal(str, str)  # File path and error message, empty on success
     
     def __init__(self, config):
         super().__init__()
@@ -66,7 +69,9 @@ class CaptureTab(QWidget):
         self.stream_active = False
         self.recording = False
         self.recording_path = None
+        self._preview_buffers = {}  # Reused by frame_to_pixmap for each frame
         self.base_dir = os.environ.get('APP_BASE_DIR', os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+        self.image_saved.connect(self.show_save_result)
         self.init_ui()
         self.init_camera()
         
@@ -192,7 +197,7 @@ class CaptureTab(QWidget):
                 self.stream_active = True
                 self.timer.start(30)  # Update every 30ms
                 self.stream_button.setText("Stop Stream")
-                self.stream_button.setStyleSheet("background-color: #e74c3c;") # Red color
+                self.stream_button.setStyleSheet(ACTIVE_BUTTON_STYLE)
             else:
                 QMessageBox.warning(self, "Stream Error", "Could not start camera stream.")
     
@@ -212,15 +217,14 @@ class CaptureTab(QWidget):
                     except Exception as e:
                         print(f"Error writing video frame: {e}")
                 
-                # Convert frame to QImage
-                height, width, channel = frame.shape
-                bytes_per_line = channel * width
-                q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
-                # Display the QImage in the QLabel
-                self.camera_view.setPixmap(QPixmap.fromImage(q_image).scaled(
-                    self.camera_view.width(), 
+                # Convert frame to a pixmap sized for the view, letting Qt
+                # read BGR frames directly
+                self.camera_view.setPixmap(frame_to_pixmap(
+                    frame,
+                    self.camera_view.width(),
                     self.camera_view.height(),
-                    Qt.KeepAspectRatio
+                    bgr=getattr(self.camera, 'native_bgr', False),
+                    buffers=self._preview_buffers
                 ))
         except Exception as e:
             print(f"Error updating frame: {e}")
@@ -255,17 +259,19 @@ class CaptureTab(QWidget):
                 
                 file_path = os.path.join(self.base_dir, 'output', 'images', filename)
                 
-                self.camera.save_image(image, file_path)
+                saved = self.camera.save_image(image, file_path)
                 
                 # Emit signal with the captured image
                 self.image_captured.emit(image)
                 
-                # Show confirmation
-                QMessageBox.information(
-                    self, 
-                    "Image Captured", 
-                    f"Image saved to:\n{file_path}"
-                )
+                # Show confirmation once the image is on disk. The RPi
+                # camera writes it in the background and returns a future
+                if isinstance(saved, Future):
+                    saved.add_done_callback(
+                        lambda future: self._report_save(file_path, future)
+                    )
+                else:
+                    self.show_save_result(file_path, "")
                 
                 return image
             else:
@@ -276,6 +282,24 @@ class CaptureTab(QWidget):
             QMessageBox.warning(self, "Capture Error", f"Error capturing image: {e}")
             return None
     
+    def _report_save(self, file_path, future):
+        """Pass a background save's outcome to the UI thread"""
+        error = future.exception()
+        message = "" if error is None else (str(error) or type(error).__name__)
+        self.image_saved.emit(file_path, message)
+    
+    @pyqtSlot(str, str)
+    def show_save_result(self, file_path, error):
+        """Tell the user whether a captured image was saved"""
+        if error:
+            QMessageBox.warning(self, "Save Error", f"Error saving image to {file_path}: {error}")
+        else:
+            QMessageBox.information(
+                self, 
+                "Image Captured", 
+                f"Image saved to:\n{file_path}"
+            )
+    
     @pyqtSlot()
     def toggle_recording(self):
         print(f"[DEBUG] toggle_recording called. recording={self.recording}, stream_active={self.stream_active}")
@@ -297,15 +321,14 @@ class CaptureTab(QWidget):
                     self.stream_active = True
                     self.timer.start(30)
                     self.stream_button.setText("Stop Stream")
-                    self.stream_button.setStyleSheet("background-color: #e74c3c;")
+                    self.stream_button.setStyleSheet(ACTIVE_BUTTON_STYLE)
                 else:
                     print("[DEBUG] Could not start camera stream!")
                     QMessageBox.warning(self, "Recording Error", "Could not start camera stream.")
                     return
 
             save_dir = os.path.join(self.base_dir, 'output', 'videos')
-            if not os.path.exists(save_dir):
-                os.makedirs(save_dir)
+            os.makedirs(save_dir, exist_ok=True)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.recording_path = os.path.join(save_dir, f"rec_{timestamp}.mp4")
@@ -316,7 +339,7 @@ class CaptureTab(QWidget):
             
             if self.recording:
                 self.record_button.setText("Stop Recording")
-                self.record_button.setStyleSheet("background-color: #e74c3c;") # Red color
+                self.record_button.setStyleSheet(ACTIVE_BUTTON_STYLE)
                 print("[DEBUG] Recording started successfully")
             else:
                 QMessageBox.critical(self, "Recording Error", "Failed to start recording.")
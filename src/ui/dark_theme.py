@@ -291,4 +291,7 @@ QSplitter::handle {
 QSplitter::handle:hover {
     background-color: #3498db;
 }
-""" 
\ No newline at end of file
+""" 
+
+# Highlight for buttons whose action is running (streaming, recording)
+ACTIVE_BUTTON_STYLE = "background-color: #e74c3c;"  # Red color
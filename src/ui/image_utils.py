@@ -0,0 +1,81 @@
+"""
+Helpers for displaying NumPy frames in Qt widgets
+"""
+
+import numpy as np
+import cv2
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+# Qt reads BGR frames as-is from 5.14 on; older Qt needs them swapped to RGB
+BGR888_AVAILABLE = hasattr(QImage, "Format_BGR888")
+
+
+def _buffer(buffers, key, shape):
+    """Return the array kept in buffers under key if it has shape, else None"""
+    if buffers is None:
+        return None
+    buffer = buffers.get(key)
+    if buffer is None or buffer.shape != shape:
+        return None
+    return buffer
+
+
+def frame_to_pixmap(frame, target_width, target_height, bgr=False, buffers=None):
+    """
+    Convert a 3-channel frame to a QPixmap fitting the target size
+    
+    Frames larger than the target are shrunk with OpenCV before they are
+    handed to Qt, so only the displayed pixels are copied into the pixmap.
+    Smaller frames are scaled up by Qt. The aspect ratio is kept either way.
+    BGR frames are handed to Qt without swapping the channels, except on
+    Qt older than 5.14, where only the displayed pixels are swapped.
+    
+    Args:
+        frame: (H, W, 3) uint8 frame
+        target_width: Width of the widget showing the frame
+        target_height: Height of the widget showing the frame
+        bgr: Whether frame is in BGR order (as decoded by OpenCV) instead
+            of RGB
+        buffers: Optional dict owned by the caller, in which the
+            downscaled and color converted frames are kept and reused by
+            the next call; for a stream of same-sized frames this saves
+            allocating them for every frame
+        
+    Returns:
+        QPixmap of the frame
+    """
+    height, width, channel = frame.shape
+    downscaled = (target_width > 0 and target_height > 0 and
+                  (width > target_width or height > target_height))
+    if downscaled:
+        scale = min(target_width / width, target_height / height)
+        width = max(1, int(width * scale))
+        height = max(1, int(height * scale))
+        frame = cv2.resize(
+            frame,
+            (width, height),
+            dst=_buffer(buffers, "scaled", (height, width, channel)),
+            interpolation=cv2.INTER_AREA
+        )
+        if buffers is not None:
+            buffers["scaled"] = frame
+    
+    if bgr and BGR888_AVAILABLE:
+        image_format = QImage.Format_BGR888
+    else:
+        if bgr:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=_buffer(buffers, "rgb", frame.shape))
+            if buffers is not None:
+                buffers["rgb"] = frame
+        image_format = QImage.Format_RGB888
+    
+    # QImage reads the raw buffer, which must be contiguous. fromImage
+    # copies the pixels, so the buffer does not need to outlive this call
+    frame = np.ascontiguousarray(frame)
+    q_image = QImage(frame.data, width, height, frame.strides[0], image_format)
+    pixmap = QPixmap.fromImage(q_image)
+    
+    if not downscaled:
+        pixmap = pixmap.scaled(target_width, target_height, Qt.KeepAspectRatio, Qt.FastTransformation)
+    return pixmap
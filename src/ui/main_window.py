@@ -245,7 +245,8 @@ class MainWindow(QMainWindow):
             # If on capture tab, capture image first then analyze
             image = self.capture_tab.capture_image()
             if image is not None:
-                self.analysis_tab.set_image(image)
+                # Captures are private copies that are only read from now on
+                self.analysis_tab.set_image(image, take_ownership=True)
                 self.analysis_tab.run_analysis()
         else:
             # Otherwise run analysis on what's in the analysis tab
@@ -18,14 +18,25 @@ DEFAULT_CONFIG = {
         "saturation": 0,
         "sharpness": 0,
         "auto_exposure": True,
-        "exposure_compensation": 0
+        "exposure_compensation": 0,
+        "buffer_count": 6,  # Camera frame buffers (more = smoother, less = lower latency/RAM)
+        "main_format": "BGR888"  # picamera2 main stream format ("RGB888" streams BGR order)
     },
     "analysis": {
         "analyze_full_video": True,
         "sample_rate": 5,  # Sample every N frames
         "highlight_color": (255, 0, 0),  # RGB for highlight points
         "highlight_radius": 5,  # Size of highlight circle
-        "average_area_size": 10  # Radius for calculating average brightness
+        "average_area_size": 10,  # Radius for calculating average brightness
+        "search_stride": 1,  # Decimation for the brightest-point search (1 = exact)
+        "frame_workers": 0,  # Threads scanning video and GIF frames (0 = one per core)
+        "use_ffmpeg_streaming": False,  # Decode analyzed videos with imageio-ffmpeg if installed
+        "two_pass": False,  # Rank videos at 1/4 resolution first, rescan the top frames (approximate)
+        "two_pass_candidates": 16,  # Frames rescanned at full resolution in two-pass mode
+        "use_opencl": False,  # Reduce frames on an OpenCL GPU when one is present
+        "gif_batch_max_bytes": 64 * 1024 * 1024,  # Largest GIF ranked as one stacked array
+        "cache_gif_frames": True,  # Keep decoded GIF frames on disk for reloading
+        "gif_cache_max_files": 8  # Decoded GIFs kept in the cache
     },
     "output": {
         "image_format": "jpg",
@@ -51,12 +62,28 @@ def get_config_path():
         config_dir = os.path.join(os.path.expanduser("~"), ".config", "BrightnessDetector")
     
     # Ensure directory exists
-    if not os.path.exists(config_dir):
-        os.makedirs(config_dir)
+    os.makedirs(config_dir, exist_ok=True)
     
     return os.path.join(config_dir, "config.json")
 
 
+def get_cache_dir():
+    """Get the directory for cached data such as decoded GIF frames"""
+    # Get appropriate cache directory for platform
+    system = platform.system()
+    if system == "Windows":
+        cache_dir = os.path.join(os.environ.get("LOCALAPPDATA"), "BrightnessDetector", "Cache")
+    elif system == "Darwin":  # macOS
+        cache_dir = os.path.join(os.path.expanduser("~"), "Library", "Caches", "BrightnessDetector")
+    else:  # Linux and others
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "BrightnessDetector")
+    
+    # Ensure directory exists
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    return cache_dir
+
+
 def load_config():
     """Load configuration from file or create default if not exists"""
     config_path = get_config_path()